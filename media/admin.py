@@ -5,6 +5,7 @@ from media.models import (
     Post,
     Comment,
     UserReaction,
+    Hashtag,
 )
 
 
@@ -12,3 +13,4 @@ admin.site.register(Profile)
 admin.site.register(Post)
 admin.site.register(Comment)
 admin.site.register(UserReaction)
+admin.site.register(Hashtag)
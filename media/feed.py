@@ -0,0 +1,253 @@
+"""Materialized home timelines (fan-out on write).
+
+Every user has a capped Redis sorted set of post ids, scored by publish
+time, holding the latest posts of the profiles they follow. Posts are pushed
+to followers' timelines when they get published, so reading a feed page is
+one range read plus one batched Post fetch.
+
+Authors with more than FEED_FAN_OUT_FOLLOWER_THRESHOLD followers are not
+pushed (hybrid push/pull): their posts only go to a small per-author
+recent-posts cache, which is merged into a reader's page at read time.
+"""
+import heapq
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from media import metrics
+from media.models import Post, Profile
+from media.redis_client import get_redis
+
+
+PULL_AUTHORS_KEY = "feed:pull_authors"
+
+
+def timeline_key(user_id: int) -> str:
+    return f"feed:timeline:{user_id}"
+
+
+def author_posts_key(author_id: int) -> str:
+    return f"feed:author:{author_id}"
+
+
+def post_score(post: Post) -> float:
+    published_at = post.scheduled_publish_time or timezone.now()
+    return published_at.timestamp()
+
+
+def follower_ids(author_id: int):
+    """Ids of users following the author, read from the through table."""
+    return (
+        Profile.following.through.objects
+        .filter(to_profile_id=author_id)
+        .values_list("from_profile_id", flat=True)
+    )
+
+
+def _write_timelines(keys, entries: dict, create: bool) -> int:
+    redis_conn = get_redis()
+    if not create:
+        pipe = redis_conn.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        keys = [key for key, found in zip(keys, pipe.execute()) if found]
+    if not keys:
+        return 0
+
+    max_length = settings.FEED_TIMELINE_LENGTH
+    pipe = redis_conn.pipeline(transaction=False)
+    for key in keys:
+        pipe.zadd(key, entries)
+        pipe.zremrangebyrank(key, 0, -max_length - 1)
+    pipe.execute()
+    return len(keys)
+
+
+def push_to_timelines(user_ids, entries: dict, create: bool = False) -> None:
+    """Add {post_id: score} entries to the given timelines and cap them.
+
+    Timelines missing from Redis are skipped unless `create` is set: a key
+    holding only the pushed entries would hide the older posts from
+    read_timeline, which rebuilds a timeline only when its key is absent.
+    """
+    batch_size = settings.FEED_FAN_OUT_BATCH_SIZE
+    written = 0
+    keys = []
+    for user_id in user_ids:
+        keys.append(timeline_key(user_id))
+        if len(keys) == batch_size:
+            written += _write_timelines(keys, entries, create)
+            keys = []
+    written += _write_timelines(keys, entries, create)
+    metrics.FEED_TIMELINE_WRITES.inc(written * len(entries))
+
+
+def fan_out_post(post: Post) -> None:
+    """Deliver a published post to the author's followers.
+
+    Every post goes to the author's recent-posts cache. It is pushed into
+    follower timelines only while the author stays under the follower
+    threshold, so publish cost does not grow with huge follower sets.
+    An author dropping back under the threshold pushes the whole cache,
+    since posts made in pull mode are no longer merged at read time.
+    """
+    redis_conn = get_redis()
+    score = post_score(post)
+    key = author_posts_key(post.user_id)
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.zadd(key, {post.id: score})
+    pipe.zremrangebyrank(key, 0, -settings.FEED_AUTHOR_POSTS_LENGTH - 1)
+    pipe.execute()
+
+    followers = follower_ids(post.user_id)
+    threshold = settings.FEED_FAN_OUT_FOLLOWER_THRESHOLD
+    if followers[:threshold + 1].count() > threshold:
+        redis_conn.sadd(PULL_AUTHORS_KEY, post.user_id)
+        metrics.FEED_PULL_POSTS.inc()
+        return
+
+    entries = {post.id: score}
+    if redis_conn.srem(PULL_AUTHORS_KEY, post.user_id):
+        entries.update(redis_conn.zrange(key, 0, -1, withscores=True))
+    push_to_timelines(
+        followers.iterator(chunk_size=settings.FEED_FAN_OUT_BATCH_SIZE),
+        entries,
+    )
+
+
+def recent_posts(author_ids, limit: int):
+    return (
+        Post.objects
+        .filter(user_id__in=author_ids, is_published=True)
+        .order_by("-scheduled_publish_time", "-id")
+        .only("id", "scheduled_publish_time")[:limit]
+    )
+
+
+def add_author_to_timeline(user_id: int, author_id: int) -> None:
+    """Merge the recent posts of a newly followed author into a timeline."""
+    add_authors_to_timeline(user_id, [author_id])
+
+
+def add_authors_to_timeline(user_id: int, author_ids) -> None:
+    """Merge the recent posts of newly followed authors into a timeline.
+
+    A timeline not built yet is left alone; it is rebuilt with these
+    authors on its next read.
+    """
+    redis_conn = get_redis()
+    if not redis_conn.exists(timeline_key(user_id)):
+        return
+    pipe = redis_conn.pipeline(transaction=False)
+    for author_id in author_ids:
+        pipe.sismember(PULL_AUTHORS_KEY, author_id)
+    push_author_ids = [
+        author_id
+        for author_id, is_pull in zip(author_ids, pipe.execute())
+        if not is_pull
+    ]
+    if not push_author_ids:
+        return
+    entries = {
+        post.id: post_score(post)
+        for post in recent_posts(
+            push_author_ids, settings.FEED_TIMELINE_LENGTH
+        )
+    }
+    if entries:
+        push_to_timelines([user_id], entries)
+
+
+def remove_author_from_timeline(user_id: int, author_id: int) -> None:
+    """Drop an unfollowed author's posts from a timeline."""
+    remove_authors_from_timeline(user_id, [author_id])
+
+
+def remove_authors_from_timeline(user_id: int, author_ids) -> None:
+    """Drop the posts of unfollowed authors from a timeline."""
+    post_ids = [
+        post.id
+        for post in recent_posts(author_ids, settings.FEED_TIMELINE_LENGTH)
+    ]
+    if post_ids:
+        get_redis().zrem(timeline_key(user_id), *post_ids)
+
+
+def rebuild_timeline(user_id: int) -> None:
+    """Rebuild a timeline from the database (cold start or lost Redis)."""
+    following_ids = (
+        Profile.following.through.objects
+        .filter(from_profile_id=user_id)
+        .values_list("to_profile_id", flat=True)
+    )
+    entries = {
+        post.id: post_score(post)
+        for post in recent_posts(following_ids, settings.FEED_TIMELINE_LENGTH)
+    }
+    if entries:
+        push_to_timelines([user_id], entries, create=True)
+
+
+def followed_pull_authors(user_id: int) -> list[int]:
+    pull_author_ids = get_redis().smembers(PULL_AUTHORS_KEY)
+    if not pull_author_ids:
+        return []
+    return list(
+        Profile.following.through.objects
+        .filter(from_profile_id=user_id, to_profile_id__in=pull_author_ids)
+        .values_list("to_profile_id", flat=True)
+    )
+
+
+def read_timeline(user_id: int, offset: int, limit: int) -> list[int]:
+    """Return post ids of a timeline page, newest first.
+
+    Posts of followed pull-mode authors are merged in from their
+    recent-posts caches.
+    """
+    redis_conn = get_redis()
+    key = timeline_key(user_id)
+    if not redis_conn.exists(key):
+        rebuild_timeline(user_id)
+
+    pull_authors = followed_pull_authors(user_id)
+    if not pull_authors:
+        return [
+            int(post_id)
+            for post_id in redis_conn.zrevrange(
+                key, offset, offset + limit - 1
+            )
+        ]
+
+    started = time.perf_counter()
+    pipe = redis_conn.pipeline(transaction=False)
+    for source in [key] + [author_posts_key(a) for a in pull_authors]:
+        pipe.zrevrange(source, 0, offset + limit - 1, withscores=True)
+    sources = [
+        [(-score, int(post_id)) for post_id, score in entries]
+        for entries in pipe.execute()
+    ]
+
+    seen = set()
+    merged = []
+    for _, post_id in heapq.merge(*sources):
+        if post_id not in seen:
+            seen.add(post_id)
+            merged.append(post_id)
+    page = merged[offset:offset + limit]
+
+    metrics.FEED_MERGE_AUTHORS.observe(len(pull_authors))
+    metrics.FEED_MERGE_SECONDS.observe(time.perf_counter() - started)
+    return page
+
+
+def get_posts(post_ids: list[int]) -> list[Post]:
+    """Fetch posts in one query, keeping the order of post_ids."""
+    posts = (
+        Post.objects
+        .filter(is_published=True)
+        .select_related("user__profile")
+        .in_bulk(post_ids)
+    )
+    return [posts[post_id] for post_id in post_ids if post_id in posts]
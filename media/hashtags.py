@@ -0,0 +1,62 @@
+import re
+
+from media.models import Hashtag, Post, PostHashtag
+
+
+HASHTAG_RE = re.compile(r"#?(\w+)", re.UNICODE)
+MAX_HASHTAG_LENGTH = Hashtag._meta.get_field("name").max_length
+
+
+def normalize_hashtag(tag: str) -> str:
+    return tag.lstrip("#").strip().casefold()[:MAX_HASHTAG_LENGTH]
+
+
+def parse_hashtags(text: str | None) -> list[str]:
+    """Split the free-form Post.hashtag value into normalized tag names.
+
+    "#Art, #summer trip" -> ["art", "summer", "trip"]
+    """
+    if not text:
+        return []
+    return list(dict.fromkeys(
+        normalize_hashtag(tag) for tag in HASHTAG_RE.findall(text)
+    ))
+
+
+def get_hashtag_ids(names) -> dict[str, int]:
+    """Return {name: id} for the names, creating missing hashtags."""
+    names = set(names)
+    if not names:
+        return {}
+    Hashtag.objects.bulk_create(
+        [Hashtag(name=name) for name in names],
+        ignore_conflicts=True
+    )
+    return dict(
+        Hashtag.objects.filter(name__in=names).values_list("name", "id")
+    )
+
+
+def link_posts(post_tags: dict[int, list[str]]) -> None:
+    """Create the post-tag rows for {post_id: [tag names]} in bulk."""
+    hashtag_ids = get_hashtag_ids(
+        name for names in post_tags.values() for name in names
+    )
+    PostHashtag.objects.bulk_create(
+        [
+            PostHashtag(post_id=post_id, hashtag_id=hashtag_ids[name])
+            for post_id, names in post_tags.items()
+            for name in names
+        ],
+        ignore_conflicts=True
+    )
+
+
+def sync_post_hashtags(post: Post) -> None:
+    """Make the post's tag rows match its hashtag text."""
+    names = parse_hashtags(post.hashtag)
+    PostHashtag.objects.filter(post=post).exclude(
+        hashtag__name__in=names
+    ).delete()
+    if names:
+        link_posts({post.id: names})
@@ -0,0 +1,93 @@
+"""Resized and WebP variants of uploaded images, made by Celery.
+
+Uploading a profile picture or a post image only stores the original and
+enqueues media.tasks.generate_image_variants once the upload is
+committed. The task renders every variant with Pillow next to the
+original (uploads/post_image/<name>-thumbnail.jpg, ...) and saves their
+names in the row's variants JSON field, which serializers turn into a
+`variants` map of URLs without touching the storage.
+"""
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db.models.functions import Now
+from PIL import Image, ImageOps
+
+from media import response_cache
+from media.models import Post, Profile
+
+
+# name: (bounding box, output format or None to keep the original one)
+VARIANTS = {
+    "thumbnail": ((150, 150), None),
+    "medium": ((800, 800), None),
+    "webp": ((800, 800), "WEBP"),
+}
+QUALITY = 85
+
+# model label: (image field, variants field, response cache tag)
+IMAGE_FIELDS = {
+    "media.post": ("image", "image_variants", response_cache.post_tag),
+    "media.profile": (
+        "profile_pic", "profile_pic_variants", response_cache.profile_tag
+    ),
+}
+MODELS = {"media.post": Post, "media.profile": Profile}
+
+
+def variant_name(name: str, variant: str, image_format: str) -> str:
+    stem, extension = os.path.splitext(name)
+    if image_format == "WEBP":
+        extension = ".webp"
+    return f"{stem}-{variant}{extension}"
+
+
+def render(image: Image.Image, size, image_format: str) -> bytes:
+    """Fit the image into `size` (never upscaling) and encode it."""
+    variant = image.copy()
+    variant.thumbnail(size, Image.Resampling.LANCZOS)
+    options = {}
+    if image_format == "JPEG":
+        if variant.mode not in ("RGB", "L"):
+            variant = variant.convert("RGB")
+        options = {"quality": QUALITY, "optimize": True}
+    elif image_format == "WEBP":
+        options = {"quality": QUALITY}
+    output = BytesIO()
+    variant.save(output, format=image_format, **options)
+    return output.getvalue()
+
+
+def generate(model_label: str, pk, source_name: str) -> dict[str, str]:
+    """Store the variants of an uploaded image, return their names.
+
+    Nothing is kept when the row has got another image meanwhile.
+    """
+    model = MODELS[model_label]
+    image_field, variants_field, cache_tag = IMAGE_FIELDS[model_label]
+    storage = model._meta.get_field(image_field).storage
+
+    with storage.open(source_name) as source:
+        original = Image.open(source)
+        original_format = original.format or "JPEG"
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    names = {}
+    for variant, (size, image_format) in VARIANTS.items():
+        image_format = image_format or original_format
+        names[variant] = storage.save(
+            variant_name(source_name, variant, image_format),
+            ContentFile(render(image, size, image_format)),
+        )
+
+    updated = model.objects.filter(
+        pk=pk, **{image_field: source_name}
+    ).update(**{variants_field: names}, updated_at=Now())
+    if not updated:
+        for name in names.values():
+            storage.delete(name)
+        return {}
+    response_cache.invalidate(cache_tag(pk))
+    return names
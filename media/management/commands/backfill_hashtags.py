@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+
+from media.hashtags import link_posts, parse_hashtags
+from media.models import Post
+
+
+class Command(BaseCommand):
+    help = "Parses Post.hashtag of existing posts into the Hashtag index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of posts processed per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        last_id = 0
+        processed = 0
+        while True:
+            batch = list(
+                Post.objects
+                .filter(id__gt=last_id)
+                .exclude(hashtag__isnull=True)
+                .exclude(hashtag="")
+                .order_by("id")
+                .values_list("id", "hashtag")[:batch_size]
+            )
+            if not batch:
+                break
+            link_posts({
+                post_id: parse_hashtags(hashtag)
+                for post_id, hashtag in batch
+            })
+            last_id = batch[-1][0]
+            processed += len(batch)
+            self.stdout.write(f"Processed {processed} posts...")
+        self.stdout.write(self.style.SUCCESS(
+            f"Hashtags backfilled for {processed} posts."
+        ))
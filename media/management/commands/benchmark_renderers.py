@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from media.management.commands.benchmark_serializers import (
+    Command as SerializerBenchmark,
+)
+from media.models import Post
+from media.renderers import ORJSONRenderer
+from media.serializers import PostListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares JSONRenderer and ORJSONRenderer throughput on "
+        "PostListSerializer pages of seeded posts (rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--page-size",
+            type=int,
+            default=100,
+            help="Number of posts per rendered page.",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=200,
+            help="Number of page renders per timed run.",
+        )
+
+    def handle(self, *args, **options):
+        page_size = options["page_size"]
+        pages = options["pages"]
+        with transaction.atomic():
+            SerializerBenchmark._seed(page_size)
+            data = {
+                "next": None,
+                "previous": None,
+                "results": PostListSerializer(
+                    Post.objects.select_related("user__profile"), many=True
+                ).data,
+            }
+            transaction.set_rollback(True)
+
+        renderers = (JSONRenderer(), ORJSONRenderer())
+        outputs = [renderer.render(data) for renderer in renderers]
+        if outputs[0] != outputs[1]:
+            self.stderr.write("Rendered outputs differ")
+            return
+
+        rates = []
+        for renderer in renderers:
+            start = time.perf_counter()
+            for _ in range(pages):
+                renderer.render(data)
+            rates.append(pages / (time.perf_counter() - start))
+            self.stdout.write(
+                f"{type(renderer).__name__}: {rates[-1]:,.0f} pages/s "
+                f"({page_size} posts, {len(outputs[0]):,} bytes)"
+            )
+        self.stdout.write(f"Speed-up: {rates[1] / rates[0]:.1f}x")
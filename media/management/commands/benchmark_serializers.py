@@ -0,0 +1,136 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from media.models import Profile, Post, UserReaction
+from media.row_serializers import (
+    PostListRowSerializer,
+    UserReactionListRowSerializer,
+)
+from media.serializers import PostListSerializer, UserReactionListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares rows/sec of the ModelSerializer and .values() row "
+        "serializers on seeded posts and reactions (rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help="Number of seeded posts and reactions.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs; the best one is reported.",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        with transaction.atomic():
+            reader = self._seed(rows)
+            cases = (
+                (
+                    "posts",
+                    Post.objects.filter(is_published=True),
+                    PostListSerializer,
+                    PostListRowSerializer,
+                    ("user__profile",),
+                ),
+                (
+                    "reactions",
+                    UserReaction.objects.filter(user=reader),
+                    UserReactionListSerializer,
+                    UserReactionListRowSerializer,
+                    ("user__profile", "post__user__profile"),
+                ),
+            )
+            for name, queryset, serializer_class, row_class, related in cases:
+                self._compare(
+                    name,
+                    queryset.order_by("id"),
+                    serializer_class,
+                    row_class,
+                    related,
+                    repeat,
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _seed(rows):
+        users = get_user_model().objects.bulk_create(
+            get_user_model()(email=f"bench{i}@bench.test")
+            for i in range(2)
+        )
+        author, reader = users
+        Profile.objects.bulk_create([
+            Profile(user=author, username="bench_author"),
+            Profile(user=reader, username="bench_reader"),
+        ])
+        posts = Post.objects.bulk_create(
+            Post(
+                user=author,
+                title=f"Post {i}",
+                message="Benchmark message " * 5,
+                image=f"uploads/post_image/bench-{i}.jpg",
+                hashtag="#bench #serializers",
+                scheduled_publish_time=timezone.now(),
+                is_published=True,
+            )
+            for i in range(rows)
+        )
+        UserReaction.objects.bulk_create(
+            UserReaction(user=reader, post=post, reaction="L")
+            for post in posts
+        )
+        return reader
+
+    def _compare(
+            self, name, queryset, serializer_class, row_class, related, repeat
+    ):
+        renderer = JSONRenderer()
+
+        def model_path():
+            return renderer.render(
+                serializer_class(
+                    queryset.select_related(*related), many=True
+                ).data
+            )
+
+        def row_path():
+            row_serializer = row_class()
+            return renderer.render(
+                row_serializer.many(row_serializer.values(queryset))
+            )
+
+        if model_path() != row_path():
+            self.stderr.write(f"{name}: outputs differ")
+            return
+
+        count = queryset.count()
+        model_rate = count / self._best_time(model_path, repeat)
+        row_rate = count / self._best_time(row_path, repeat)
+        self.stdout.write(
+            f"{name}: ModelSerializer {model_rate:,.0f} rows/s, "
+            f"row serializer {row_rate:,.0f} rows/s "
+            f"({row_rate / model_rate:.1f}x)"
+        )
+
+    @staticmethod
+    def _best_time(func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
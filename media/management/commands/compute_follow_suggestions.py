@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from media import suggestions
+
+
+class Command(BaseCommand):
+    help = "Computes who-to-follow suggestions of every user into Redis"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=None,
+            help="Number of suggestions kept per user.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Number of users whose suggestions are computed at once.",
+        )
+
+    def handle(self, *args, **options):
+        stored = suggestions.compute(
+            top_k=options["top_k"], chunk_size=options["chunk_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored follow suggestions of {stored} users."
+        ))
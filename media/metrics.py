@@ -0,0 +1,109 @@
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import CounterMetricFamily
+
+from media.redis_client import get_redis
+
+
+class RedisCounter:
+    """A Prometheus counter kept in a Redis hash.
+
+    Fan-out runs in Celery workers and requests are spread over several
+    web processes, each with its own prometheus registry, so counts
+    incremented there would never reach MetricsView. Every process adds
+    to the same hash instead (one field per label set) and
+    RedisCounterCollector reads it back when metrics are scraped.
+    """
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.key = f"metrics:{name}"
+
+    def labels(self, **labels) -> "_BoundRedisCounter":
+        return _BoundRedisCounter(
+            self, "|".join(labels[name] for name in self.labelnames)
+        )
+
+    def inc(self, amount: int = 1) -> None:
+        _BoundRedisCounter(self, "").inc(amount)
+
+    def get(self) -> float:
+        return _BoundRedisCounter(self, "").get()
+
+    def family(self, values: dict) -> CounterMetricFamily:
+        family = CounterMetricFamily(
+            self.name, self.documentation, labels=self.labelnames
+        )
+        if not self.labelnames:
+            values = {"": values.get("", 0)}
+        for field, value in values.items():
+            label_values = field.split("|") if self.labelnames else []
+            family.add_metric(label_values, float(value))
+        return family
+
+
+class _BoundRedisCounter:
+
+    def __init__(self, counter: RedisCounter, field: str):
+        self.counter = counter
+        self.field = field
+
+    def inc(self, amount: int = 1) -> None:
+        if amount:
+            get_redis().hincrby(self.counter.key, self.field, amount)
+
+    def get(self) -> float:
+        return float(get_redis().hget(self.counter.key, self.field) or 0)
+
+
+class RedisCounterCollector:
+    """Expose the RedisCounter values through the default registry."""
+
+    def __init__(self, counters):
+        self.counters = counters
+
+    def describe(self):
+        # Lets the registry check names without reaching Redis
+        return [counter.family({}) for counter in self.counters]
+
+    def collect(self):
+        pipe = get_redis().pipeline(transaction=False)
+        for counter in self.counters:
+            pipe.hgetall(counter.key)
+        return [
+            counter.family(values)
+            for counter, values in zip(self.counters, pipe.execute())
+        ]
+
+
+FEED_TIMELINE_WRITES = RedisCounter(
+    "feed_timeline_writes_total",
+    "Post ids written into follower timelines (fan-out write amplification).",
+)
+FEED_PULL_POSTS = RedisCounter(
+    "feed_pull_posts_total",
+    "Posts of high-follower authors kept for read-time merge "
+    "instead of being pushed.",
+)
+FEED_MERGE_AUTHORS = Histogram(
+    "feed_merge_authors",
+    "Pull-mode authors merged into a timeline page at read time.",
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100),
+)
+FEED_MERGE_SECONDS = Histogram(
+    "feed_merge_seconds",
+    "Time spent merging pull-mode authors into a timeline page.",
+)
+RESPONSE_CACHE_REQUESTS = RedisCounter(
+    "response_cache_requests_total",
+    "Detail responses served from the response cache (hit) or built "
+    "(miss).",
+    ["view", "result"],
+)
+
+REGISTRY.register(
+    RedisCounterCollector(
+        [FEED_TIMELINE_WRITES, FEED_PULL_POSTS, RESPONSE_CACHE_REQUESTS]
+    )
+)
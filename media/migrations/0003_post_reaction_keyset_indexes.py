@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0002_alter_profile_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="post",
+            options={"ordering": ["scheduled_publish_time"],
+                     "verbose_name_plural": "posts"},
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", True)),
+                fields=["scheduled_publish_time", "id"],
+                name="post_published_keyset_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userreaction",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="reaction_user_keyset_idx",
+            ),
+        ),
+    ]
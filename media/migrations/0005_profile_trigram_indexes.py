@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:10
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0004_post_search_vector"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["username"],
+                name="profile_username_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="profile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["bio"],
+                name="profile_bio_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.1.1 on 2026-10-18 03:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0005_profile_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Hashtag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                "verbose_name_plural": "hashtags",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.CreateModel(
+            name="PostHashtag",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "hashtag",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_hashtags",
+                        to="media.hashtag",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="post_hashtags",
+                        to="media.post",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "post hashtags",
+            },
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="tags",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="posts",
+                through="media.PostHashtag",
+                to="media.hashtag",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="posthashtag",
+            constraint=models.UniqueConstraint(
+                fields=("hashtag", "post"),
+                name="unique_post_hashtag",
+            ),
+        ),
+    ]
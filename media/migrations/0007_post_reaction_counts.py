@@ -0,0 +1,39 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0006_hashtags"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="dislike_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="like_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE media_post AS post
+                SET like_count = counts.likes,
+                    dislike_count = counts.dislikes
+                FROM (
+                    SELECT post_id,
+                           COUNT(*) FILTER (WHERE reaction = 'L') AS likes,
+                           COUNT(*) FILTER (WHERE reaction = 'D') AS dislikes
+                    FROM media_userreaction
+                    GROUP BY post_id
+                ) AS counts
+                WHERE counts.post_id = post.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0007_post_reaction_counts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                DELETE FROM media_userreaction AS duplicate
+                USING media_userreaction AS kept
+                WHERE duplicate.user_id = kept.user_id
+                  AND duplicate.post_id = kept.post_id
+                  AND duplicate.id > kept.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        # 0007 counted the duplicates just deleted
+        migrations.RunSQL(
+            sql="""
+                UPDATE media_post AS post
+                SET like_count = counts.likes,
+                    dislike_count = counts.dislikes
+                FROM (
+                    SELECT post_id,
+                           COUNT(*) FILTER (WHERE reaction = 'L') AS likes,
+                           COUNT(*) FILTER (WHERE reaction = 'D') AS dislikes
+                    FROM media_userreaction
+                    GROUP BY post_id
+                ) AS counts
+                WHERE counts.post_id = post.id
+                  AND (post.like_count, post.dislike_count)
+                      IS DISTINCT FROM (counts.likes, counts.dislikes)
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="userreaction",
+            constraint=models.UniqueConstraint(
+                fields=("user", "post"),
+                name="unique_user_post_reaction",
+            ),
+        ),
+    ]
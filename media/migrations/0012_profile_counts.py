@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0011_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="follower_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="following_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE media_profile AS profile
+                SET follower_count = (
+                        SELECT COUNT(*) FROM media_profile_following
+                        WHERE to_profile_id = profile.user_id
+                    ),
+                    following_count = (
+                        SELECT COUNT(*) FROM media_profile_following
+                        WHERE from_profile_id = profile.user_id
+                    ),
+                    post_count = (
+                        SELECT COUNT(*) FROM media_post
+                        WHERE user_id = profile.user_id AND is_published
+                    )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0012_profile_counts"),
+    ]
+
+    # The auto-created through table only has (from, to) and single-column
+    # indexes; this one returns a profile's followers sorted by id
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE INDEX IF NOT EXISTS following_to_from_idx
+                ON media_profile_following (to_profile_id, from_profile_id)
+            """,
+            reverse_sql="DROP INDEX IF EXISTS following_to_from_idx",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0013_following_to_from_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_published", False)),
+                fields=["scheduled_publish_time", "id"],
+                name="post_unpublished_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("media", "0014_post_unpublished_due_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="profile_pic_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -1,7 +1,11 @@
 import os
 import uuid
+from typing import NamedTuple
 
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import connection, models
+from django.utils import timezone
 
 from user.models import User
 from django.utils.text import slugify
@@ -19,6 +23,19 @@ def movie_image_file_path(instance, filename):
     return os.path.join(f"uploads/{folder}/", filename)
 
 
+class ProfileQuerySet(models.QuerySet):
+    def with_following(self):
+        """Join the user and prefetch the followed users' emails at once."""
+        return self.select_related("user").prefetch_related(
+            models.Prefetch(
+                "following",
+                queryset=Profile.objects.select_related("user").only(
+                    "user__email"
+                )
+            )
+        )
+
+
 class Profile(models.Model):
     user = models.OneToOneField(
         User,
@@ -32,6 +49,9 @@ class Profile(models.Model):
         null=True,
         blank=True
     )
+    profile_pic_variants = models.JSONField(
+        default=dict, blank=True, editable=False
+    )
     bio = models.CharField(max_length=400, null=True, blank=True)
     following = models.ManyToManyField(
         "self",
@@ -39,6 +59,12 @@ class Profile(models.Model):
         related_name="followers",
         blank=True
     )
+    follower_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    post_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ProfileQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.user.email} Profile"
@@ -46,6 +72,118 @@ class Profile(models.Model):
     class Meta:
         verbose_name_plural = "profiles"
         ordering = ["user_id"]
+        indexes = [
+            GinIndex(
+                fields=["username"],
+                opclasses=["gin_trgm_ops"],
+                name="profile_username_trgm_idx",
+            ),
+            GinIndex(
+                fields=["bio"],
+                opclasses=["gin_trgm_ops"],
+                name="profile_bio_trgm_idx",
+            ),
+        ]
+
+
+class Hashtag(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return f"#{self.name}"
+
+    class Meta:
+        verbose_name_plural = "hashtags"
+        ordering = ["name"]
+
+
+class PublishedPost(NamedTuple):
+    id: int
+    user_id: int
+    hashtag: str | None
+
+
+class PostManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
+    def publish_due(self, now, limit: int) -> list[PublishedPost]:
+        """Publish up to `limit` posts due by `now`, oldest first.
+
+        Runs as a single statement that picks the rows from the partial
+        index of unpublished posts, so it touches only due posts, and
+        adds them to their authors' post_count. Rows locked by a
+        concurrent run are skipped.
+        """
+        table = self.model._meta.db_table
+        sql = f"""
+            WITH due AS (
+                SELECT id FROM {table}
+                WHERE NOT is_published
+                    AND scheduled_publish_time <= %(now)s
+                ORDER BY scheduled_publish_time, id
+                LIMIT %(limit)s
+                FOR UPDATE SKIP LOCKED
+            ), published AS (
+                UPDATE {table} AS post
+                SET is_published = TRUE, updated_at = %(now)s
+                FROM due
+                WHERE post.id = due.id
+                RETURNING post.id, post.user_id, post.hashtag,
+                    post.scheduled_publish_time
+            ), counted AS (
+                {self._count_published_sql()}
+            )
+            SELECT id, user_id, hashtag FROM published
+            ORDER BY scheduled_publish_time, id
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, {"now": now, "limit": limit})
+            rows = cursor.fetchall()
+        return [PublishedPost(*row) for row in rows]
+
+    def publish_scheduled(
+            self, post_id: int, publish_time, now
+    ) -> PublishedPost | None:
+        """Publish a post if it is unpublished and due at `publish_time`.
+
+        Returns None when the post is published already, was moved to
+        another time or is not due yet, so repeated calls are no-ops.
+        """
+        table = self.model._meta.db_table
+        sql = f"""
+            WITH published AS (
+                UPDATE {table}
+                SET is_published = TRUE, updated_at = %(now)s
+                WHERE id = %(post_id)s
+                    AND NOT is_published
+                    AND scheduled_publish_time = %(publish_time)s
+                    AND scheduled_publish_time <= %(now)s
+                RETURNING id, user_id, hashtag
+            ), counted AS (
+                {self._count_published_sql()}
+            )
+            SELECT id, user_id, hashtag FROM published
+        """
+        params = {"post_id": post_id, "publish_time": publish_time, "now": now}
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        return PublishedPost(*row) if row else None
+
+    @staticmethod
+    def _count_published_sql() -> str:
+        """UPDATE adding the rows of the `published` CTE to post_count."""
+        return f"""
+            UPDATE {Profile._meta.db_table} AS profile
+            SET post_count = profile.post_count + authors.posts,
+                updated_at = %(now)s
+            FROM (
+                SELECT user_id, COUNT(*) AS posts FROM published
+                GROUP BY user_id
+            ) AS authors
+            WHERE profile.user_id = authors.user_id
+        """
 
 
 class Post(models.Model):
@@ -61,9 +199,30 @@ class Post(models.Model):
         null=True,
         blank=True
     )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     hashtag = models.CharField(max_length=255, null=True, blank=True)
+    tags = models.ManyToManyField(
+        Hashtag,
+        through="PostHashtag",
+        related_name="posts",
+        blank=True
+    )
     scheduled_publish_time = models.DateTimeField(null=True, blank=True)
     is_published = models.BooleanField(default=False)
+    like_count = models.PositiveIntegerField(default=0)
+    dislike_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config="english")
+            + SearchVector("hashtag", weight="B", config="english")
+            + SearchVector("message", weight="C", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = PostManager()
 
     def __str__(self):
         return f"{self.user.email} Title: {self.title[0:10]}"
@@ -71,6 +230,44 @@ class Post(models.Model):
     class Meta:
         verbose_name_plural = "posts"
         ordering = ["scheduled_publish_time"]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="post_search_vector_idx"),
+            models.Index(
+                fields=["scheduled_publish_time", "id"],
+                condition=models.Q(is_published=True),
+                name="post_published_keyset_idx",
+            ),
+            models.Index(
+                fields=["scheduled_publish_time", "id"],
+                condition=models.Q(is_published=False),
+                name="post_unpublished_due_idx",
+            ),
+        ]
+
+
+class PostHashtag(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="post_hashtags"
+    )
+    hashtag = models.ForeignKey(
+        Hashtag,
+        on_delete=models.CASCADE,
+        related_name="post_hashtags"
+    )
+
+    def __str__(self):
+        return f"{self.hashtag} Post: {self.post_id}"
+
+    class Meta:
+        verbose_name_plural = "post hashtags"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["hashtag", "post"],
+                name="unique_post_hashtag",
+            ),
+        ]
 
 
 class Comment(models.Model):
@@ -89,14 +286,108 @@ class Comment(models.Model):
         on_delete=models.CASCADE,
         related_name="comments"
     )
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="replies"
+    )
+    # Materialized path: zero-padded ids of the ancestors and the comment
+    # itself, so a subtree is one prefix scan ordered depth-first.
+    path = models.TextField(default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    PATH_SEPARATOR = "/"
+    PATH_STEP_WIDTH = 19
 
     def __str__(self):
         return f"{self.user.email} Comment: {self.comment[0:10]}"
 
+    @classmethod
+    def path_step(cls, comment_id: int) -> str:
+        return str(comment_id).zfill(cls.PATH_STEP_WIDTH)
+
+    @property
+    def ancestor_ids(self) -> list[int]:
+        steps = self.path.split(self.PATH_SEPARATOR)[:-1]
+        return [int(step) for step in steps]
+
     class Meta:
         verbose_name_plural = "comments"
         ordering = ["post", "created_at"]
+        indexes = [
+            models.Index(
+                fields=["post", "created_at", "id"],
+                name="comment_post_keyset_idx",
+            ),
+            models.Index(
+                fields=["path"],
+                name="comment_path_idx",
+                opclasses=["text_pattern_ops"],
+            ),
+        ]
+
+
+class ReactionUpsert(NamedTuple):
+    post_author_id: int | None
+    reaction_id: int | None
+    created: bool
+
+
+class UserReactionManager(models.Manager):
+    def upsert(self, user_id: int, post_id: int, reaction: str):
+        """Create or switch a reaction and update Post counters at once.
+
+        Runs as a single INSERT ... ON CONFLICT statement. reaction_id is
+        None when the post is missing, is the user's own post or already
+        has the same reaction; post_author_id tells these cases apart.
+        """
+        reaction_table = self.model._meta.db_table
+        post_table = Post._meta.db_table
+        sql = f"""
+            WITH target AS (
+                SELECT id, user_id FROM {post_table} WHERE id = %(post_id)s
+            ), upsert AS (
+                INSERT INTO {reaction_table}
+                    (user_id, post_id, reaction, created_at)
+                SELECT %(user_id)s, id, %(reaction)s, %(created_at)s
+                FROM target
+                WHERE user_id <> %(user_id)s
+                ON CONFLICT (user_id, post_id) DO UPDATE
+                    SET reaction = EXCLUDED.reaction
+                    WHERE {reaction_table}.reaction <> EXCLUDED.reaction
+                RETURNING id, (xmax = 0) AS created
+            ), counters AS (
+                UPDATE {post_table} SET
+                    like_count = GREATEST(like_count + CASE
+                        WHEN %(reaction)s = 'L' THEN 1
+                        WHEN upsert.created THEN 0 ELSE -1 END, 0),
+                    dislike_count = GREATEST(dislike_count + CASE
+                        WHEN %(reaction)s = 'D' THEN 1
+                        WHEN upsert.created THEN 0 ELSE -1 END, 0),
+                    updated_at = %(created_at)s
+                FROM upsert
+                WHERE {post_table}.id = %(post_id)s
+            )
+            SELECT target.user_id, upsert.id, COALESCE(upsert.created, FALSE)
+            FROM target LEFT JOIN upsert ON TRUE
+        """
+        params = {
+            "user_id": user_id,
+            "post_id": post_id,
+            "reaction": reaction,
+            "created_at": timezone.now(),
+        }
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            row = cursor.fetchone()
+        if row is None:
+            return ReactionUpsert(None, None, False)
+        return ReactionUpsert(*row)
 
 
 class UserReaction(models.Model):
@@ -104,6 +395,10 @@ class UserReaction(models.Model):
         ("D", "Dislike"),
         ("L", "Like"),
     )
+    COUNTER_FIELDS = {
+        "D": "dislike_count",
+        "L": "like_count",
+    }
 
     user = models.ForeignKey(
         User,
@@ -122,6 +417,8 @@ class UserReaction(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = UserReactionManager()
+
     def __str__(self):
         return (f"{self.user.email} "
                 f"Post: {self.post.title[0:10]} "
@@ -130,3 +427,15 @@ class UserReaction(models.Model):
     class Meta:
         verbose_name_plural = "reactions"
         ordering = ["post", "created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "post"],
+                name="unique_user_post_reaction",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="reaction_user_keyset_idx",
+            ),
+        ]
@@ -0,0 +1,249 @@
+import base64
+import binascii
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Opaque cursor pagination on a unique composite ordering key.
+
+    Pages are fetched with a WHERE (key) > (cursor) seek instead of
+    COUNT(*) + OFFSET, so deep pages cost the same as the first one.
+    Clients sending ?page= keep getting the legacy page-number responses.
+    """
+    ordering = ("id",)
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    legacy_query_param = "page"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.legacy = None
+        if self.legacy_query_param in request.query_params:
+            self.legacy = PageNumberPagination()
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        reverse, position = self.decode_cursor(request, queryset)
+        ordering = [
+            self._reverse_field(field) if reverse else field
+            for field in self.ordering
+        ]
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self._seek(queryset, ordering, position)
+            )
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None if not reverse else has_more
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def decode_cursor(self, request, queryset):
+        """Return (reverse, position) with the position in field types."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            reverse, position = bool(data["r"]), data["p"]
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+                not isinstance(position, list)
+                or len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                self._ordering_field(queryset, field).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return reverse, position
+
+    @staticmethod
+    def _ordering_field(queryset, field):
+        """Model field or annotation output field an ordering sorts on."""
+        name = field.lstrip("-")
+        try:
+            return queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return queryset.query.annotations[name].output_field
+
+    def encode_cursor(self, obj, reverse):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = obj[name] if isinstance(obj, dict) else getattr(obj, name)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            position.append(value)
+        data = json.dumps({"r": int(reverse), "p": position})
+        encoded = base64.urlsafe_b64encode(data.encode()).decode()
+        return replace_query_param(
+            self.request.build_absolute_uri(),
+            self.cursor_query_param,
+            encoded
+        )
+
+    @staticmethod
+    def _reverse_field(field):
+        return field[1:] if field.startswith("-") else f"-{field}"
+
+    @staticmethod
+    def _seek(queryset, ordering, position):
+        """Build the "row comes after position" filter for the ordering.
+
+        Nullable keys follow PostgreSQL ordering: NULLs sort last
+        ascending and first descending.
+        """
+        seek = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            ascending = not field.startswith("-")
+            try:
+                nullable = queryset.model._meta.get_field(name).null
+            except FieldDoesNotExist:
+                nullable = False
+
+            if value is None:
+                after = Q() if ascending else Q(**{f"{name}__isnull": False})
+            else:
+                lookup = "gt" if ascending else "lt"
+                after = Q(**{f"{name}__{lookup}": value})
+                if nullable and ascending:
+                    after |= Q(**{f"{name}__isnull": True})
+
+            if after:
+                seek |= Q(**equal) & after
+            equal[name] = value
+        return seek or Q(pk__in=[])
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(
+                self.request.build_absolute_uri(),
+                self.cursor_query_param
+            )
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri"
+                },
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor from the next/previous link.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+            {
+                "name": self.legacy_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Legacy page number pagination "
+                               "(slower on deep pages).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class PostKeysetPagination(KeysetPagination):
+    ordering = ("scheduled_publish_time", "id")
+
+
+class PostSearchPagination(KeysetPagination):
+    """Pages of search results, best ranked first."""
+    ordering = ("-rank", "-id")
+
+
+class PostTagPagination(KeysetPagination):
+    """Posts of a hashtag, newest first, seeking on the (tag, post) index."""
+    ordering = ("-id",)
+
+
+class HashtagKeysetPagination(KeysetPagination):
+    ordering = ("name",)
+
+
+class ProfileKeysetPagination(KeysetPagination):
+    ordering = ("user_id",)
+
+
+class ProfileSearchPagination(KeysetPagination):
+    """Pages of fuzzy profile search results, most relevant first."""
+    ordering = ("-relevance", "-user_id")
+
+
+class CommentKeysetPagination(KeysetPagination):
+    ordering = ("created_at", "id")
+
+
+class ReactionKeysetPagination(KeysetPagination):
+    ordering = ("created_at", "id")
@@ -0,0 +1,25 @@
+import codecs
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from media.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser on orjson; NaN and Infinity are always rejected."""
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        data = stream.read() if stream is not None else b""
+        if codecs.lookup(encoding).name != "utf-8":
+            data = data.decode(encoding)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,97 @@
+"""Exact-time publishing of scheduled posts with ETA tasks.
+
+Saving an unpublished post with a publish time enqueues
+media.tasks.publish_scheduled_post to run at that time. The task id
+and the time it was enqueued for are kept in Redis, so saving the post
+again with the same time enqueues nothing, and a new time revokes the
+old task. The task only flips a post still unpublished and still due
+at the time it was enqueued for, so duplicate, early or stale
+deliveries (e.g. a revoke lost by a restarted worker) change nothing.
+
+Only posts due within PUBLISH_ETA_WINDOW get their task when saved.
+The Redis broker redelivers tasks not acknowledged within its
+visibility timeout and workers hold ETA tasks in memory until they run,
+so far-off posts are left to the periodic publishing_post sweep, which
+enqueues the tasks of posts entering the window and publishes anything
+already due as a safety net.
+"""
+import datetime
+
+from celery import current_app
+from django.conf import settings
+from django.utils import timezone
+
+from media.models import Post
+from media.redis_client import get_redis
+
+
+# Kept after the publish time, so a late re-save is still recognized
+ETA_KEY_GRACE = 24 * 60 * 60
+
+
+def eta_key(post_id: int) -> str:
+    return f"publish:eta:{post_id}"
+
+
+def _revoke(task_id: str) -> None:
+    # Eager tasks have already run and there is no broker to tell
+    if not current_app.conf.task_always_eager:
+        current_app.control.revoke(task_id)
+
+
+def schedule(post_id: int, publish_time, is_published: bool) -> None:
+    """Enqueue, move or cancel the publish task of a post."""
+    from media.tasks import publish_scheduled_post
+
+    if (
+        is_published
+        or publish_time is None
+        or publish_time > timezone.now() + settings.PUBLISH_ETA_WINDOW
+    ):
+        cancel(post_id)
+        return
+    redis_conn = get_redis()
+    key = eta_key(post_id)
+    eta = publish_time.astimezone(datetime.timezone.utc).isoformat()
+    current = redis_conn.hgetall(key)
+    if current.get("eta") == eta:
+        return
+    if current:
+        _revoke(current["task_id"])
+
+    result = publish_scheduled_post.apply_async(
+        (post_id, eta), eta=publish_time
+    )
+    delay = max(int((publish_time - timezone.now()).total_seconds()), 0)
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.hset(key, mapping={"task_id": result.id, "eta": eta})
+    pipe.expire(key, delay + ETA_KEY_GRACE)
+    pipe.execute()
+
+
+def cancel(post_id: int) -> None:
+    """Revoke the pending publish task of a post, if any."""
+    redis_conn = get_redis()
+    task_id = redis_conn.hget(eta_key(post_id), "task_id")
+    if task_id is not None:
+        _revoke(task_id)
+        redis_conn.delete(eta_key(post_id))
+
+
+def schedule_upcoming(current_time) -> int:
+    """Enqueue the tasks of posts due within the window, return the count.
+
+    Posts whose task is already pending are skipped by schedule().
+    """
+    upcoming = Post.objects.filter(
+        is_published=False,
+        scheduled_publish_time__gt=current_time,
+        scheduled_publish_time__lte=(
+            current_time + settings.PUBLISH_ETA_WINDOW
+        ),
+    ).values_list("id", "scheduled_publish_time")
+    count = 0
+    for post_id, publish_time in upcoming.iterator():
+        schedule(post_id, publish_time, False)
+        count += 1
+    return count
@@ -0,0 +1,148 @@
+"""Write-behind buffer for reactions (settings.REACTION_WRITE_BEHIND).
+
+The API appends reactions to a Redis stream and acknowledges them at
+once. A Celery task drains the stream in batches: one upsert of all
+reactions, one UPDATE per counter, and one XDEL. Until a reaction is
+flushed it is kept in a per-user pending hash, so the caller still sees
+it when listing their reactions.
+"""
+import time
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest, Now
+
+from media import response_cache
+from media.models import Post, UserReaction
+from media.redis_client import get_redis
+
+
+STREAM_KEY = "reactions:stream"
+FLUSH_LOCK_KEY = "reactions:flush-lock"
+FLUSH_LOCK_TIMEOUT = 5 * 60
+
+
+def pending_key(user_id: int) -> str:
+    return f"reactions:pending:{user_id}"
+
+
+def enqueue(user_id: int, post_id: int, reaction: str) -> None:
+    version = str(time.time_ns())
+    pipe = get_redis().pipeline()
+    pipe.xadd(STREAM_KEY, {
+        "user_id": user_id,
+        "post_id": post_id,
+        "reaction": reaction,
+        "version": version,
+    })
+    pipe.hset(pending_key(user_id), post_id, f"{reaction}:{version}")
+    pipe.execute()
+
+
+def pending_reactions(user_id: int) -> dict[int, str]:
+    """Return {post_id: reaction} of the user's not yet flushed reactions."""
+    return {
+        int(post_id): value.split(":", 1)[0]
+        for post_id, value in get_redis().hgetall(pending_key(user_id)).items()
+    }
+
+
+def _save_batch(latest: dict) -> None:
+    """Upsert the newest reaction per (user, post) and adjust counters."""
+    post_ids = {post_id for _, post_id in latest}
+    authors = dict(
+        Post.objects.filter(id__in=post_ids).values_list("id", "user_id")
+    )
+    existing = {
+        (user_id, post_id): reaction
+        for user_id, post_id, reaction in UserReaction.objects.filter(
+            user_id__in={user_id for user_id, _ in latest},
+            post_id__in=post_ids,
+        ).values_list("user_id", "post_id", "reaction")
+    }
+
+    reactions = []
+    deltas = defaultdict(lambda: defaultdict(int))
+    for (user_id, post_id), reaction in latest.items():
+        if authors.get(post_id) in (None, user_id):
+            continue
+        old = existing.get((user_id, post_id))
+        if old == reaction:
+            continue
+        reactions.append(
+            UserReaction(user_id=user_id, post_id=post_id, reaction=reaction)
+        )
+        deltas[UserReaction.COUNTER_FIELDS[reaction]][post_id] += 1
+        if old:
+            deltas[UserReaction.COUNTER_FIELDS[old]][post_id] -= 1
+
+    with transaction.atomic():
+        response_cache.invalidate(*[
+            response_cache.post_tag(reaction.post_id)
+            for reaction in reactions
+        ])
+        UserReaction.objects.bulk_create(
+            reactions,
+            update_conflicts=True,
+            unique_fields=["user", "post"],
+            update_fields=["reaction"],
+        )
+        for counter, changes in deltas.items():
+            Post.objects.filter(id__in=changes).update(**{
+                counter: Greatest(
+                    F(counter) + Case(
+                        *[When(id=post_id, then=Value(delta))
+                          for post_id, delta in changes.items()],
+                        default=Value(0),
+                    ),
+                    Value(0),
+                ),
+                "updated_at": Now(),
+            })
+
+
+def _clear_pending(entries: list) -> None:
+    """Drop pending values that were not replaced by a newer reaction."""
+    redis_conn = get_redis()
+    pipe = redis_conn.pipeline(transaction=False)
+    for _, fields in entries:
+        pipe.hget(pending_key(fields["user_id"]), fields["post_id"])
+    current = pipe.execute()
+
+    pipe = redis_conn.pipeline(transaction=False)
+    for (_, fields), value in zip(entries, current):
+        if value == f"{fields['reaction']}:{fields['version']}":
+            pipe.hdel(pending_key(fields["user_id"]), fields["post_id"])
+    pipe.execute()
+
+
+def flush(batch_size: int | None = None) -> int:
+    """Drain the stream into the database, return flushed entry count."""
+    redis_conn = get_redis()
+    batch_size = batch_size or settings.REACTION_FLUSH_BATCH_SIZE
+    token = uuid.uuid4().hex
+    if not redis_conn.set(FLUSH_LOCK_KEY, token, nx=True,
+                          ex=FLUSH_LOCK_TIMEOUT):
+        return 0
+
+    flushed = 0
+    try:
+        while True:
+            entries = redis_conn.xrange(STREAM_KEY, count=batch_size)
+            if not entries:
+                return flushed
+            latest = {
+                (int(fields["user_id"]), int(fields["post_id"])):
+                    fields["reaction"]
+                for _, fields in entries
+            }
+            _save_batch(latest)
+            _clear_pending(entries)
+            redis_conn.xdel(STREAM_KEY, *[entry_id for entry_id, _ in entries])
+            flushed += len(entries)
+    finally:
+        if redis_conn.get(FLUSH_LOCK_KEY) == token:
+            redis_conn.delete(FLUSH_LOCK_KEY)
@@ -0,0 +1,34 @@
+import redis
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+FAKE_REDIS_URL = "fakeredis://"
+
+_connections = {}
+
+
+def get_redis() -> redis.Redis:
+    """Return a shared Redis connection for settings.REDIS_URL.
+
+    Every process must reach the same Redis, so a missing REDIS_URL is a
+    configuration error. Test settings use FAKE_REDIS_URL, an in-process
+    fakeredis store (a test-only dependency).
+    """
+    url = settings.REDIS_URL
+    if not url:
+        raise ImproperlyConfigured(
+            "Set REDIS_URL to the Redis shared by the web and Celery "
+            "processes, e.g. redis://redis:6379/1."
+        )
+    if url not in _connections:
+        if url == FAKE_REDIS_URL:
+            import fakeredis
+
+            _connections[url] = fakeredis.FakeRedis(decode_responses=True)
+        else:
+            _connections[url] = redis.Redis.from_url(
+                url,
+                decode_responses=True
+            )
+    return _connections[url]
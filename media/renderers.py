@@ -0,0 +1,48 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer on orjson, matching the stdlib one for API data.
+
+    Datetimes come out as DRF's JSONEncoder writes them: ISO 8601 with
+    all microseconds and "Z" for UTC (unlike Django's DjangoJSONEncoder,
+    DRF does not cut them to milliseconds). Types orjson does not know
+    (Decimal, lazy translation strings, timedelta, querysets...) are
+    converted by JSONEncoder itself. Indented or ASCII-only output is
+    left to the stdlib renderer.
+
+    Floats are where the bytes differ: exponents are written without
+    "+" or leading zeros (1e16, not 1e+16), and NaN and Infinity are
+    rendered as null.
+    """
+    options = orjson.OPT_UTC_Z
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        try:
+            ret = orjson.dumps(
+                data, default=JSONEncoder().default, option=self.options
+            )
+        except orjson.JSONEncodeError:
+            # e.g. non-string dict keys or integers over 64 bits
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+
+        # Keep \u2028 and \u2029 escaped like JSONRenderer does, so the
+        # output stays a strict JavaScript subset.
+        if not ret.isascii():
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,132 @@
+"""Redis cache of rendered detail responses.
+
+Entries are keyed on the view, the caller's authorization scope and the
+full URL with sorted query params, and are filed under the version of
+the object they show (a post or a profile). Saving or deleting anything
+shown by such a response bumps that version from a signal, so readers
+stop seeing the old entry at once and it expires on its own TTL.
+Reading the version before the response is built also keeps a response
+computed during a concurrent write from being served afterwards.
+
+Every bump also bumps the version of the tag's collection ("post" or
+"profile"). List ETags are built from the versions of a tag (e.g. the
+comments of one post) or of a whole collection.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+import orjson
+from django.conf import settings
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from media.metrics import RESPONSE_CACHE_REQUESTS
+from media.redis_client import get_redis
+from media.renderers import ORJSONRenderer
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def profile_tag(user_id: int) -> str:
+    return f"profile:{user_id}"
+
+
+def version_key(tag: str) -> str:
+    return f"respcache:version:{tag}"
+
+
+def collection(tag: str) -> str:
+    return tag.split(":", 1)[0]
+
+
+def _version_timeout(tag: str):
+    # Collection versions never expire: a list ETag must not come back
+    # after its collection has changed
+    if tag == collection(tag):
+        return None
+    return 2 * settings.RESPONSE_CACHE_TIMEOUT
+
+
+def current_versions(*tags: str) -> list:
+    """Current versions of tags or collections, for list ETags.
+
+    A tag version that never existed or has expired is started with a
+    fresh timestamp, so it cannot match an ETag built before it expired.
+    """
+    redis_conn = get_redis()
+    keys = [version_key(tag) for tag in tags]
+    versions = redis_conn.mget(keys)
+    missing = [tag for tag, version in zip(tags, versions) if version is None]
+    if not missing:
+        return versions
+
+    version = time.time_ns()
+    pipe = redis_conn.pipeline(transaction=False)
+    for tag in missing:
+        pipe.set(
+            version_key(tag), version, nx=True, ex=_version_timeout(tag)
+        )
+    pipe.execute()
+    return redis_conn.mget(keys)
+
+
+def get_scope(request) -> str:
+    """Authorization scope: responses may differ only between scopes."""
+    user = request.user
+    if not user or not user.is_authenticated:
+        return "anon"
+    return "staff" if user.is_staff else "user"
+
+
+def entry_key(view_name: str, tag: str, version, request) -> str:
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url_hash = hashlib.sha1(
+        f"{request.path}?{query}".encode()
+    ).hexdigest()
+    return (
+        f"respcache:{view_name}:{tag}:{version}:"
+        f"{get_scope(request)}:{url_hash}"
+    )
+
+
+def cached_response(view_name: str, tag: str, request, get_response):
+    """Return the cached response data or build, cache and return it."""
+    redis_conn = get_redis()
+    version = redis_conn.get(version_key(tag)) or 0
+    key = entry_key(view_name, tag, version, request)
+
+    cached = redis_conn.get(key)
+    if cached is not None:
+        RESPONSE_CACHE_REQUESTS.labels(view=view_name, result="hit").inc()
+        return Response(orjson.loads(cached))
+
+    RESPONSE_CACHE_REQUESTS.labels(view=view_name, result="miss").inc()
+    response = get_response()
+    if response.status_code == status.HTTP_200_OK:
+        redis_conn.set(
+            key,
+            ORJSONRenderer().render(response.data),
+            ex=settings.RESPONSE_CACHE_TIMEOUT
+        )
+    return response
+
+
+def invalidate(*tags: str) -> None:
+    """Drop cached responses of the tags once the transaction commits."""
+    if not tags:
+        return
+
+    def bump_versions():
+        # Versions are timestamps rather than counters, so a version that
+        # expired and is set again never matches an entry still alive.
+        version = time.time_ns()
+        pipe = get_redis().pipeline(transaction=False)
+        for tag in set(tags) | {collection(tag) for tag in tags}:
+            pipe.set(version_key(tag), version, ex=_version_timeout(tag))
+        pipe.execute()
+
+    transaction.on_commit(bump_versions)
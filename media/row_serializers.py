@@ -0,0 +1,149 @@
+"""Read-only serializers that render `.values()` rows.
+
+ModelSerializer builds its fields for every request and resolves each
+SlugRelatedField through model instances (post.user.profile...). These
+serializers fetch only the columns they output with one `.values()`
+query and map each row with per-field functions compiled once, giving
+the same JSON as their ModelSerializer counterparts.
+"""
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from media.models import Post, UserReaction
+
+
+class RowSerializer:
+    """Map `.values()` rows to response dicts.
+
+    `fields` lists (output name, values() lookup) pairs in output order.
+    Lookups named in `datetime_fields` are rendered like DRF's
+    DateTimeField, those in `file_fields` like its FileField and those in
+    `variant_fields` (lookup: file field) like ImageVariantsField.
+    """
+    model = None
+    fields = ()
+    datetime_fields = ()
+    file_fields = ()
+    variant_fields = {}
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self.lookups = [lookup for _, lookup in self.fields]
+        self.mappers = [
+            (name, lookup, self._get_mapper(lookup))
+            for name, lookup in self.fields
+        ]
+
+    def _get_mapper(self, lookup):
+        if lookup in self.datetime_fields:
+            return self._datetime_mapper()
+        if lookup in self.file_fields:
+            return self._file_mapper(lookup)
+        if lookup in self.variant_fields:
+            return self._variants_mapper(self.variant_fields[lookup])
+        return None
+
+    @staticmethod
+    def _datetime_mapper():
+        field = serializers.DateTimeField()
+        if not settings.USE_TZ or api_settings.DATETIME_FORMAT != ISO_8601:
+            return field.to_representation
+        field_timezone = field.default_timezone()
+
+        def to_iso(value):
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith("+00:00"):
+                value = value[:-6] + "Z"
+            return value
+        return to_iso
+
+    def _file_mapper(self, lookup):
+        storage = self.model._meta.get_field(lookup).storage
+        request = self.context.get("request")
+        scheme_host = request.build_absolute_uri("/")[:-1] if request else ""
+
+        if isinstance(storage, FileSystemStorage):
+            # FileSystemStorage.url() without urljoin() for each row
+            base_url = storage.base_url
+
+            def get_url(name):
+                return base_url + filepath_to_uri(name).lstrip("/")
+        else:
+            get_url = storage.url
+
+        def to_url(name):
+            if not name:
+                return None
+            url = get_url(name)
+            if request is None:
+                return url
+            if (
+                    url.startswith("/") and not url.startswith("//")
+                    and "/./" not in url and "/../" not in url
+            ):
+                return scheme_host + url
+            return request.build_absolute_uri(url)
+        return to_url
+
+    def _variants_mapper(self, file_field):
+        to_url = self._file_mapper(file_field)
+
+        def to_urls(variants):
+            return {name: to_url(path) for name, path in variants.items()}
+        return to_urls
+
+    def values(self, queryset, *extra_fields):
+        """Select the output columns plus e.g. the pagination keys."""
+        fields = self.lookups + [
+            field for field in extra_fields if field not in self.lookups
+        ]
+        return queryset.values(*fields)
+
+    def to_representation(self, row):
+        return {
+            name: row[lookup] if mapper is None or row[lookup] is None
+            else mapper(row[lookup])
+            for name, lookup, mapper in self.mappers
+        }
+
+    def many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class PostListRowSerializer(RowSerializer):
+    """Rows rendered like PostListSerializer."""
+    model = Post
+    fields = (
+        ("id", "id"),
+        ("user", "user__email"),
+        ("username", "user__profile__username"),
+        ("title", "title"),
+        ("message", "message"),
+        ("image", "image"),
+        ("variants", "image_variants"),
+        ("hashtag", "hashtag"),
+        ("scheduled_publish_time", "scheduled_publish_time"),
+        ("is_published", "is_published"),
+        ("like_count", "like_count"),
+        ("dislike_count", "dislike_count"),
+    )
+    datetime_fields = ("scheduled_publish_time",)
+    file_fields = ("image",)
+    variant_fields = {"image_variants": "image"}
+
+
+class UserReactionListRowSerializer(RowSerializer):
+    """Rows rendered like UserReactionListSerializer."""
+    model = UserReaction
+    fields = (
+        ("id", "id"),
+        ("user", "user__email"),
+        ("username", "user__profile__username"),
+        ("post_username", "post__user__profile__username"),
+        ("title", "post__title"),
+        ("message", "post__message"),
+        ("reaction", "reaction"),
+    )
@@ -0,0 +1,154 @@
+"""Full-text search over posts.
+
+PostgresSearchBackend ranks matches of the generated, GIN-indexed
+Post.search_vector column. InMemorySearchBackend keeps a pure-Python
+inverted index with the same API for tests and local development.
+The backend is chosen by settings.POST_SEARCH_BACKEND.
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast
+from django.utils.module_loading import import_string
+
+from media.models import Post
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str | None) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+class PostgresSearchBackend:
+    """Ranked search on the tsvector column (weights: title, tag, text)."""
+
+    config = "english"
+
+    def search(self, queryset, query: str):
+        search_query = SearchQuery(
+            query,
+            config=self.config,
+            search_type="websearch"
+        )
+        return (
+            queryset
+            .filter(search_vector=search_query)
+            .annotate(rank=Cast(
+                SearchRank(F("search_vector"), search_query),
+                FloatField()
+            ))
+        )
+
+    def index_post(self, post: Post) -> None:
+        """The database keeps the generated column up to date."""
+
+    def remove_post(self, post_id: int) -> None:
+        """The database keeps the generated column up to date."""
+
+
+class InMemorySearchBackend:
+    """Pure-Python inverted index of post terms ranked by TF-IDF.
+
+    The index is loaded from the database on first search and kept in
+    sync by Post signals, so it only sees writes of its own process.
+    """
+
+    fields = (("title", 3.0), ("hashtag", 2.0), ("message", 1.0))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = None
+        self._documents = {}
+
+    def _terms(self, post) -> dict[str, float]:
+        terms = defaultdict(float)
+        for field, weight in self.fields:
+            for token in tokenize(getattr(post, field)):
+                terms[token] += weight
+        return terms
+
+    def _ensure_loaded(self) -> None:
+        if self._postings is not None:
+            return
+        with self._lock:
+            if self._postings is not None:
+                return
+            self._postings = defaultdict(dict)
+            posts = Post.objects.only("id", "title", "hashtag", "message")
+            for post in posts.iterator(chunk_size=2000):
+                self._add(post)
+
+    def _add(self, post) -> None:
+        terms = self._terms(post)
+        self._documents[post.id] = set(terms)
+        for term, frequency in terms.items():
+            self._postings[term][post.id] = frequency
+
+    def _remove(self, post_id: int) -> None:
+        for term in self._documents.pop(post_id, ()):
+            self._postings[term].pop(post_id, None)
+            if not self._postings[term]:
+                del self._postings[term]
+
+    def index_post(self, post: Post) -> None:
+        if self._postings is None:
+            return
+        with self._lock:
+            self._remove(post.id)
+            self._add(post)
+
+    def remove_post(self, post_id: int) -> None:
+        if self._postings is None:
+            return
+        with self._lock:
+            self._remove(post_id)
+
+    def rank(self, query: str) -> dict[int, float]:
+        """Score posts containing every query term."""
+        self._ensure_loaded()
+        terms = set(tokenize(query))
+        postings = [self._postings.get(term, {}) for term in terms]
+        if not postings or not all(postings):
+            return {}
+
+        postings.sort(key=len)
+        matches = set(postings[0]).intersection(*postings[1:])
+        total = len(self._documents)
+        scores = {}
+        for post_id in matches:
+            scores[post_id] = sum(
+                posting[post_id] * math.log(1 + total / len(posting))
+                for posting in postings
+            )
+        return scores
+
+    def search(self, queryset, query: str):
+        scores = self.rank(query)
+        if not scores:
+            return queryset.none().annotate(
+                rank=Value(0.0, output_field=FloatField())
+            )
+        return queryset.filter(id__in=scores).annotate(
+            rank=Case(
+                *[When(id=post_id, then=Value(score))
+                  for post_id, score in scores.items()],
+                output_field=FloatField(),
+            )
+        )
+
+
+_backends = {}
+
+
+def get_search_backend():
+    path = settings.POST_SEARCH_BACKEND
+    if path not in _backends:
+        _backends[path] = import_string(path)()
+    return _backends[path]
@@ -1,6 +1,26 @@
+from django.conf import settings
 from rest_framework import serializers
 
-from media.models import Profile, Post, UserReaction, Comment
+from media.models import Profile, Post, UserReaction, Comment, Hashtag
+
+
+class ImageVariantsField(serializers.ReadOnlyField):
+    """Map of image variant names to URLs built like FileField URLs."""
+
+    def __init__(self, file_field, **kwargs):
+        self.file_field = file_field
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        storage = self.parent.Meta.model._meta.get_field(
+            self.file_field
+        ).storage
+        request = self.context.get("request")
+        urls = {}
+        for name, path in value.items():
+            url = storage.url(path)
+            urls[name] = request.build_absolute_uri(url) if request else url
+        return urls
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -10,6 +30,9 @@ class ProfileSerializer(serializers.ModelSerializer):
         slug_field="email"
     )
     following = serializers.SerializerMethodField()
+    variants = ImageVariantsField(
+        file_field="profile_pic", source="profile_pic_variants"
+    )
 
     class Meta:
         model = Profile
@@ -18,14 +41,47 @@ class ProfileSerializer(serializers.ModelSerializer):
             "user",
             "username",
             "profile_pic",
-            "bio", "following"
+            "variants",
+            "bio", "following",
+            "follower_count",
+            "following_count",
+            "post_count",
         )
+        read_only_fields = ("follower_count", "following_count", "post_count")
         extra_kwargs = {"profile_pic": {"read_only": True}}
 
     def get_following(self, obj) -> list[str]:
         return [f.user.email for f in obj.following.all()]
 
 
+class FollowSuggestionSerializer(serializers.ModelSerializer):
+    shared_connections = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Profile
+        fields = (
+            "user_id",
+            "username",
+            "profile_pic",
+            "follower_count",
+            "shared_connections",
+        )
+
+
+class BulkFollowSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=settings.BULK_FOLLOW_MAX_IDS,
+        write_only=True
+    )
+
+
+class BulkFollowResultSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+
+
 class ProfileImageSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -57,6 +113,7 @@ class PostListSerializer(serializers.ModelSerializer):
         many=False,
         slug_field="username"
     )
+    variants = ImageVariantsField(file_field="image", source="image_variants")
 
     class Meta:
         model = Post
@@ -67,13 +124,28 @@ class PostListSerializer(serializers.ModelSerializer):
             "title",
             "message",
             "image",
+            "variants",
             "hashtag",
             "scheduled_publish_time",
             "is_published",
+            "like_count",
+            "dislike_count",
         )
         extra_kwargs = {"image": {"read_only": True}}
 
 
+class HashtagSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Hashtag
+        fields = ("id", "name")
+
+
+class TrendingHashtagSerializer(serializers.Serializer):
+    name = serializers.CharField(read_only=True)
+    count = serializers.IntegerField(read_only=True)
+
+
 class PostImageSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -141,6 +213,8 @@ class UserReactionListSerializer(serializers.ModelSerializer):
 
 
 class UserReactionCreateSerializer(serializers.ModelSerializer):
+    post = serializers.IntegerField(source="post_id")
+
     class Meta:
         model = UserReaction
         fields = ("id", "post", "reaction")
@@ -149,9 +223,17 @@ class UserReactionCreateSerializer(serializers.ModelSerializer):
 class CommentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
-        fields = ("id", "user", "comment", "post")
+        fields = ("id", "user", "comment", "post", "parent")
         extra_kwargs = {"user": {"read_only": True}}
 
+    def validate(self, attrs):
+        parent = attrs.get("parent")
+        if parent and parent.post_id != attrs["post"].id:
+            raise serializers.ValidationError(
+                {"parent": "Reply must belong to the post of its parent."}
+            )
+        return attrs
+
 
 class CommentSerializer(serializers.ModelSerializer):
     username = serializers.SlugRelatedField(
@@ -166,6 +248,47 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ("id", "username", "comment", "post", "created_at")
 
 
+class PostCommentSerializer(serializers.ModelSerializer):
+    """Comment of a post page; usernames come from a per-page lookup."""
+    username = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = (
+            "id",
+            "username",
+            "comment",
+            "post",
+            "reply_count",
+            "created_at",
+        )
+
+    def get_username(self, obj) -> str | None:
+        return self.context["usernames"].get(obj.user_id)
+
+
+class CommentThreadSerializer(PostCommentSerializer):
+    """Comment of a thread; the view nests replies under their parents."""
+    replies = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Comment
+        fields = (
+            "id",
+            "username",
+            "comment",
+            "post",
+            "parent",
+            "depth",
+            "reply_count",
+            "created_at",
+            "replies",
+        )
+
+    def get_replies(self, obj) -> list[dict]:
+        return []
+
+
 class AllCommentsOfPostSerializer(serializers.ModelSerializer):
     post_username = serializers.SlugRelatedField(
         source="user.profile",
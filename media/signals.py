@@ -0,0 +1,169 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest, Now
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from media.hashtags import sync_post_hashtags
+from media import publishing, response_cache
+from media.models import Comment, Post, Profile, UserReaction
+from media.search import get_search_backend
+
+
+@receiver(post_save, sender=Post)
+def index_post_for_search(sender, instance, **kwargs):
+    get_search_backend().index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search(sender, instance, **kwargs):
+    get_search_backend().remove_post(instance.id)
+
+
+@receiver(post_save, sender=Post)
+def update_post_hashtags(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "hashtag" in update_fields:
+        sync_post_hashtags(instance)
+
+
+@receiver(post_save, sender=Post)
+def schedule_post_publishing(sender, instance, **kwargs):
+    post_id = instance.id
+    publish_time = instance.scheduled_publish_time
+    is_published = instance.is_published
+    transaction.on_commit(
+        lambda: publishing.schedule(post_id, publish_time, is_published)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def cancel_post_publishing(sender, instance, **kwargs):
+    post_id = instance.id
+    transaction.on_commit(lambda: publishing.cancel(post_id))
+
+
+@receiver(post_save, sender=Comment)
+def place_comment_in_thread(sender, instance, created, **kwargs):
+    if not created:
+        return
+    step = Comment.path_step(instance.id)
+    if instance.parent_id:
+        parent = instance.parent
+        instance.path = parent.path + Comment.PATH_SEPARATOR + step
+        instance.depth = parent.depth + 1
+    else:
+        instance.path = step
+        instance.depth = 0
+    Comment.objects.filter(id=instance.id).update(
+        path=instance.path, depth=instance.depth
+    )
+    if instance.ancestor_ids:
+        Comment.objects.filter(id__in=instance.ancestor_ids).update(
+            reply_count=F("reply_count") + 1, updated_at=Now()
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def remove_comment_from_thread(sender, instance, **kwargs):
+    # Deleting a comment cascades to its replies and every deleted reply
+    # sends this signal, so each one only accounts for itself.
+    if instance.ancestor_ids:
+        Comment.objects.filter(
+            id__in=instance.ancestor_ids, reply_count__gt=0
+        ).update(reply_count=F("reply_count") - 1, updated_at=Now())
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=UserReaction)
+@receiver(post_delete, sender=UserReaction)
+def invalidate_post_responses(sender, instance, **kwargs):
+    post_id = instance.id if sender is Post else instance.post_id
+    response_cache.invalidate(response_cache.post_tag(post_id))
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def invalidate_profile_responses(sender, instance, **kwargs):
+    # Post and comment responses show the username of their authors
+    post_ids = set(
+        Post.objects.filter(user_id=instance.user_id).values_list(
+            "id", flat=True
+        )
+    ) | set(
+        Comment.objects.filter(user_id=instance.user_id).values_list(
+            "post_id", flat=True
+        )
+    )
+    response_cache.invalidate(
+        response_cache.profile_tag(instance.user_id),
+        *[response_cache.post_tag(post_id) for post_id in post_ids]
+    )
+
+
+def _add_to_count(field: str, delta: int):
+    # Drifted counters may be lower than the decrement until reconciled
+    return Greatest(F(field) + delta, 0)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def update_post_count(sender, instance, created=None, **kwargs):
+    # Only published posts count. Scheduled ones are added when
+    # PostManager publishes them; other publish flips on save() are left
+    # to reconcile_profile_counts.
+    if created is False or not instance.is_published:
+        return
+    Profile.objects.filter(user_id=instance.user_id).update(
+        post_count=_add_to_count("post_count", 1 if created else -1),
+        updated_at=Now()
+    )
+    response_cache.invalidate(response_cache.profile_tag(instance.user_id))
+
+
+@receiver(m2m_changed, sender=Profile.following.through)
+def update_follow_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        own_field, other_field = "to_profile_id", "from_profile_id"
+        own_count, other_count = "follower_count", "following_count"
+    else:
+        own_field, other_field = "from_profile_id", "to_profile_id"
+        own_count, other_count = "following_count", "follower_count"
+
+    if action == "post_add":
+        user_ids = list(pk_set)
+        delta = 1
+    elif action in ("pre_remove", "pre_clear"):
+        # remove() reports every id it was given, so count only the edges
+        # that exist; locking them keeps concurrent removals from both
+        # counting one edge
+        edges = sender.objects.filter(**{own_field: instance.pk})
+        if action == "pre_remove":
+            edges = edges.filter(**{f"{other_field}__in": pk_set})
+        user_ids = list(
+            edges.select_for_update()
+            .order_by(other_field)
+            .values_list(other_field, flat=True)
+        )
+        delta = -1
+    else:
+        return
+    if not user_ids:
+        return
+
+    Profile.objects.filter(pk=instance.pk).update(
+        **{own_count: _add_to_count(own_count, delta * len(user_ids))},
+        updated_at=Now()
+    )
+    Profile.objects.filter(pk__in=user_ids).update(
+        **{other_count: _add_to_count(other_count, delta)},
+        updated_at=Now()
+    )
+    response_cache.invalidate(
+        *[
+            response_cache.profile_tag(user_id)
+            for user_id in [instance.pk, *user_ids]
+        ]
+    )
@@ -0,0 +1,116 @@
+"""Who-to-follow suggestions computed offline from the follow graph.
+
+A Celery job loads media_profile_following into a sparse adjacency
+matrix A (A[u, v] = 1 when u follows v). Row u of A @ A counts, for
+every candidate, how many accounts followed by u follow the candidate.
+The product is computed a chunk of rows at a time, u and the accounts
+u already follows are dropped, and the top K candidates of every user
+are stored in Redis as one value, so reading them is a single GET.
+"""
+import itertools
+
+import numpy as np
+import orjson
+from django.conf import settings
+from scipy import sparse
+
+from media.models import Profile
+from media.redis_client import get_redis
+
+
+def suggestions_key(user_id: int) -> str:
+    return f"suggest:follow:{user_id}"
+
+
+def load_adjacency(batch_size: int):
+    """Return the user ids and the CSR adjacency matrix of the graph.
+
+    Row and column i of the matrix belong to user_ids[i].
+    """
+    edges = Profile.following.through.objects.values_list(
+        "from_profile_id", "to_profile_id"
+    ).order_by()
+    flat_edges = np.fromiter(
+        itertools.chain.from_iterable(
+            edges.iterator(chunk_size=batch_size)
+        ),
+        dtype=np.int64,
+    )
+    user_ids, indices = np.unique(flat_edges, return_inverse=True)
+    indices = indices.reshape(-1, 2)
+    adjacency = sparse.csr_matrix(
+        (
+            np.ones(len(indices), dtype=np.int32),
+            (indices[:, 0], indices[:, 1]),
+        ),
+        shape=(len(user_ids), len(user_ids)),
+    )
+    return user_ids, adjacency
+
+
+def _two_hop_counts(adjacency, start: int, end: int):
+    """Shared-connection counts of rows start:end, followed ones dropped."""
+    rows = adjacency[start:end]
+    counts = (rows @ adjacency).tocsr()
+    excluded = (
+        rows + sparse.csr_matrix(
+            (
+                np.ones(end - start, dtype=np.int32),
+                (np.arange(end - start), np.arange(start, end)),
+            ),
+            shape=rows.shape,
+        )
+    ).tocsr()
+    excluded.data[:] = 1
+    counts = (counts - counts.multiply(excluded)).tocsr()
+    counts.eliminate_zeros()
+    return counts
+
+
+def compute(
+        top_k: int | None = None,
+        chunk_size: int | None = None,
+        batch_size: int | None = None,
+) -> int:
+    """Store the top suggestions of every user, return how many got any."""
+    top_k = top_k or settings.FOLLOW_SUGGESTIONS_TOP_K
+    chunk_size = chunk_size or settings.FOLLOW_SUGGESTIONS_CHUNK_SIZE
+    batch_size = batch_size or settings.FOLLOW_GRAPH_BATCH_SIZE
+    user_ids, adjacency = load_adjacency(batch_size)
+
+    stored = 0
+    for start in range(0, len(user_ids), chunk_size):
+        end = min(start + chunk_size, len(user_ids))
+        counts = _two_hop_counts(adjacency, start, end)
+        pipe = get_redis().pipeline(transaction=False)
+        for row in range(end - start):
+            key = suggestions_key(int(user_ids[start + row]))
+            row_start, row_end = counts.indptr[row], counts.indptr[row + 1]
+            if row_start == row_end:
+                pipe.delete(key)
+                continue
+            shared = counts.data[row_start:row_end].astype(np.int64)
+            candidates = user_ids[counts.indices[row_start:row_end]]
+            if len(shared) > top_k:
+                keep = np.argpartition(-shared, top_k - 1)[:top_k]
+                shared, candidates = shared[keep], candidates[keep]
+            order = np.lexsort((candidates, -shared))
+            pipe.set(
+                key,
+                orjson.dumps(
+                    np.column_stack((candidates[order], shared[order])),
+                    option=orjson.OPT_SERIALIZE_NUMPY,
+                ),
+                ex=settings.FOLLOW_SUGGESTIONS_TIMEOUT,
+            )
+            stored += 1
+        pipe.execute()
+    return stored
+
+
+def get_suggestions(user_id: int) -> list[tuple[int, int]]:
+    """(user id, shared connections) pairs, best first."""
+    value = get_redis().get(suggestions_key(user_id))
+    if value is None:
+        return []
+    return [tuple(pair) for pair in orjson.loads(value)]
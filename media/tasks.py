@@ -1,14 +1,232 @@
+from datetime import datetime
+
 from celery import shared_task
 
+from django.conf import settings
+from django.db.models import Count, Q
 from django.utils import timezone
 
-from media.models import Post
+from media import (
+    feed,
+    image_variants,
+    publishing,
+    reaction_buffer,
+    response_cache,
+    suggestions,
+    trending,
+)
+from media.hashtags import parse_hashtags
+from media.models import Post, Profile, UserReaction
 
 
 @shared_task
-def publishing_post() -> None:
+def publishing_post(batch_size: int | None = None) -> list[int]:
+    """Publish every due post in chunks, return the ids flipped.
+
+    Only unpublished posts are touched, so the run time follows the
+    number of due posts rather than the whole post history. Posts
+    entering the ETA window then get their exact-time publish task.
+    """
+    batch_size = batch_size or settings.PUBLISH_BATCH_SIZE
     current_time = timezone.now()
-    queryset = Post.objects.filter(scheduled_publish_time__lte=current_time)
-    for post in queryset:
-        post.is_published = True
-        post.save()
+    published_ids = []
+    while True:
+        published = Post.objects.publish_due(current_time, batch_size)
+        on_posts_published(published)
+        published_ids.extend(post.id for post in published)
+        if len(published) < batch_size:
+            break
+    publishing.schedule_upcoming(current_time)
+    return published_ids
+
+
+@shared_task
+def publish_scheduled_post(post_id: int, publish_time: str) -> bool:
+    """ETA task of media.publishing: publish one post at its time."""
+    published = Post.objects.publish_scheduled(
+        post_id, datetime.fromisoformat(publish_time), timezone.now()
+    )
+    if published is None:
+        return False
+    on_posts_published([published])
+    return True
+
+
+def on_posts_published(published) -> None:
+    """Feed freshly published posts to trending, caches and timelines.
+
+    The publish UPDATE skips Post signals, so the consumers of a
+    published post are notified here.
+    """
+    for post in published:
+        trending.record_hashtags(parse_hashtags(post.hashtag))
+    response_cache.invalidate(
+        *[response_cache.post_tag(post.id) for post in published],
+        *[response_cache.profile_tag(post.user_id) for post in published]
+    )
+    for post in published:
+        fan_out_post_to_timelines.delay(post.id)
+
+
+@shared_task
+def fan_out_post_to_timelines(post_id: int) -> None:
+    post = Post.objects.filter(id=post_id, is_published=True).first()
+    if post:
+        feed.fan_out_post(post)
+
+
+@shared_task
+def add_author_to_timeline(user_id: int, author_id: int) -> None:
+    feed.add_author_to_timeline(user_id, author_id)
+
+
+@shared_task
+def remove_author_from_timeline(user_id: int, author_id: int) -> None:
+    feed.remove_author_from_timeline(user_id, author_id)
+
+
+@shared_task
+def add_authors_to_timeline(user_id: int, author_ids: list[int]) -> None:
+    feed.add_authors_to_timeline(user_id, author_ids)
+
+
+@shared_task
+def remove_authors_from_timeline(user_id: int, author_ids: list[int]) -> None:
+    feed.remove_authors_from_timeline(user_id, author_ids)
+
+
+@shared_task
+def compact_trending_hashtags() -> None:
+    trending.compact()
+
+
+@shared_task
+def reconcile_reaction_counts(batch_size: int = 1000) -> int:
+    """Fix drifted Post like/dislike counters, one batch of posts at a time.
+
+    Returns the number of corrected posts.
+    """
+    fixed = 0
+    last_id = 0
+    while True:
+        posts = list(
+            Post.objects
+            .filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "like_count", "dislike_count")[:batch_size]
+        )
+        if not posts:
+            return fixed
+        last_id = posts[-1].id
+
+        counts = {
+            row["post_id"]: row
+            for row in UserReaction.objects
+            .filter(post_id__in=[post.id for post in posts])
+            .values("post_id")
+            .annotate(
+                likes=Count("id", filter=Q(reaction="L")),
+                dislikes=Count("id", filter=Q(reaction="D")),
+            )
+            .order_by()
+        }
+        drifted = []
+        for post in posts:
+            row = counts.get(post.id, {"likes": 0, "dislikes": 0})
+            if (post.like_count, post.dislike_count) != (
+                    row["likes"], row["dislikes"]
+            ):
+                post.like_count = row["likes"]
+                post.dislike_count = row["dislikes"]
+                post.updated_at = timezone.now()
+                drifted.append(post)
+        Post.objects.bulk_update(
+            drifted, ["like_count", "dislike_count", "updated_at"]
+        )
+        response_cache.invalidate(
+            *[response_cache.post_tag(post.id) for post in drifted]
+        )
+        fixed += len(drifted)
+
+
+@shared_task
+def reconcile_profile_counts(batch_size: int = 1000) -> int:
+    """Fix drifted Profile follower/following/post counters in batches.
+
+    Returns the number of corrected profiles.
+    """
+    through = Profile.following.through
+    count_fields = ("follower_count", "following_count", "post_count")
+    fixed = 0
+    last_id = 0
+    while True:
+        profiles = list(
+            Profile.objects
+            .filter(user_id__gt=last_id)
+            .order_by("user_id")
+            .only("user_id", *count_fields)[:batch_size]
+        )
+        if not profiles:
+            return fixed
+        last_id = profiles[-1].user_id
+        user_ids = [profile.user_id for profile in profiles]
+
+        counts = {
+            "follower_count": dict(
+                through.objects.filter(to_profile_id__in=user_ids)
+                .values("to_profile_id")
+                .annotate(count=Count("id"))
+                .values_list("to_profile_id", "count")
+                .order_by()
+            ),
+            "following_count": dict(
+                through.objects.filter(from_profile_id__in=user_ids)
+                .values("from_profile_id")
+                .annotate(count=Count("id"))
+                .values_list("from_profile_id", "count")
+                .order_by()
+            ),
+            "post_count": dict(
+                Post.objects.filter(user_id__in=user_ids, is_published=True)
+                .values("user_id")
+                .annotate(count=Count("id"))
+                .values_list("user_id", "count")
+                .order_by()
+            ),
+        }
+        drifted = []
+        for profile in profiles:
+            actual = [
+                counts[field].get(profile.user_id, 0)
+                for field in count_fields
+            ]
+            if [getattr(profile, field) for field in count_fields] != actual:
+                for field, value in zip(count_fields, actual):
+                    setattr(profile, field, value)
+                profile.updated_at = timezone.now()
+                drifted.append(profile)
+        Profile.objects.bulk_update(drifted, [*count_fields, "updated_at"])
+        response_cache.invalidate(
+            *[
+                response_cache.profile_tag(profile.user_id)
+                for profile in drifted
+            ]
+        )
+        fixed += len(drifted)
+
+
+@shared_task
+def flush_reaction_buffer() -> int:
+    return reaction_buffer.flush()
+
+
+@shared_task
+def compute_follow_suggestions() -> int:
+    return suggestions.compute()
+
+
+@shared_task
+def generate_image_variants(
+        model_label: str, pk: int, source_name: str
+) -> dict[str, str]:
+    return image_variants.generate(model_label, pk, source_name)
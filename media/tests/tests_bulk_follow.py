@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media import feed
+from media.models import Post, Profile
+from media.redis_client import get_redis
+
+BULK_FOLLOW_URL = reverse("media:bulk-follow")
+BULK_UNFOLLOW_URL = reverse("media:bulk-unfollow")
+
+
+class BulkFollowTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.client = APIClient()
+        self.profiles = []
+        for i in range(4):
+            user = get_user_model().objects.create_user(
+                email=f"user{i}@test.com",
+                password="test_password12"
+            )
+            self.profiles.append(
+                Profile.objects.create(user=user, username=f"User_{i}")
+            )
+        self.me = self.profiles[0]
+        self.ids = [profile.user_id for profile in self.profiles]
+        self.client.force_authenticate(user=self.me.user)
+
+    def test_bulk_follow_returns_result_per_id(self):
+        """Test every requested id gets a status in request order"""
+        me, second, third, _ = self.ids
+        with self.captureOnCommitCallbacks(execute=True):
+            self.me.following.add(self.profiles[1])
+            res = self.client.post(
+                BULK_FOLLOW_URL,
+                {"user_ids": [third, second, 999999, me, third]},
+                format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], [
+            {"user_id": third, "status": "followed"},
+            {"user_id": second, "status": "already_following"},
+            {"user_id": 999999, "status": "not_found"},
+            {"user_id": me, "status": "cannot_follow_self"},
+        ])
+        self.assertEqual(
+            set(self.me.following.values_list("user_id", flat=True)),
+            {second, third}
+        )
+
+    def test_bulk_follow_query_count_does_not_grow_with_ids(self):
+        """Test profiles are resolved and saved with a fixed query count"""
+        feed.push_to_timelines([self.ids[0]], {0: 0}, create=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertNumQueries(8):
+                res = self.client.post(
+                    BULK_FOLLOW_URL,
+                    {"user_ids": self.ids[1:]},
+                    format="json"
+                )
+        self.assertEqual(
+            [result["status"] for result in res.data["results"]],
+            ["followed"] * 3
+        )
+
+    def test_bulk_follow_merges_posts_into_timeline(self):
+        """Test the newly followed authors' posts reach the timeline"""
+        post = Post.objects.create(
+            user=self.profiles[1].user,
+            title="Title",
+            message="Message",
+            is_published=True
+        )
+
+        self.client.post(
+            BULK_FOLLOW_URL, {"user_ids": self.ids[1:]}, format="json"
+        )
+        self.assertEqual(feed.read_timeline(self.ids[0], 0, 10), [post.id])
+
+        self.client.post(
+            BULK_UNFOLLOW_URL, {"user_ids": [self.ids[1]]}, format="json"
+        )
+        self.assertEqual(feed.read_timeline(self.ids[0], 0, 10), [])
+
+    def test_bulk_unfollow(self):
+        """Test unfollowing deletes only the followed ids"""
+        me, second, third, fourth = self.ids
+        with self.captureOnCommitCallbacks(execute=True):
+            self.me.following.add(self.profiles[1], self.profiles[3])
+            res = self.client.post(
+                BULK_UNFOLLOW_URL,
+                {"user_ids": [second, third, 999999]},
+                format="json"
+            )
+
+        self.assertEqual(res.data["results"], [
+            {"user_id": second, "status": "unfollowed"},
+            {"user_id": third, "status": "not_following"},
+            {"user_id": 999999, "status": "not_found"},
+        ])
+        self.assertEqual(
+            list(self.me.following.values_list("user_id", flat=True)),
+            [fourth]
+        )
+
+    def test_bulk_follow_validates_ids(self):
+        """Test an empty or oversized id list is rejected"""
+        res = self.client.post(
+            BULK_FOLLOW_URL, {"user_ids": []}, format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.post(
+            BULK_FOLLOW_URL,
+            {"user_ids": list(range(1, settings.BULK_FOLLOW_MAX_IDS + 2))},
+            format="json"
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
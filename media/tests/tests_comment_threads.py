@@ -0,0 +1,104 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media.models import Comment, Profile, Post
+
+
+COMMENTS_URL = reverse("media:comment-list")
+
+
+def thread_url(comment_id):
+    return reverse("media:comment-thread", args=[comment_id])
+
+
+class CommentThreadTests(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=self.user, username="Admin_user")
+        self.post = Post.objects.create(
+            user=self.user,
+            title="Post",
+            scheduled_publish_time=timezone.now(),
+            is_published=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _reply(self, parent=None, text="Reply"):
+        res = self.client.post(COMMENTS_URL, {
+            "comment": text,
+            "post": self.post.id,
+            "parent": parent.id if parent else "",
+        })
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        return Comment.objects.get(id=res.data["id"])
+
+    def test_replies_keep_path_depth_and_reply_count(self):
+        """Test replies extend the path and count on every ancestor"""
+        root = self._reply()
+        child = self._reply(root)
+        grandchild = self._reply(child)
+        self._reply(root)
+
+        root.refresh_from_db()
+        child.refresh_from_db()
+        self.assertEqual(grandchild.depth, 2)
+        self.assertEqual(grandchild.ancestor_ids, [root.id, child.id])
+        self.assertEqual((root.reply_count, child.reply_count), (3, 1))
+
+        child.delete()
+        root.refresh_from_db()
+        self.assertEqual(root.reply_count, 1)
+
+    def test_thread_is_nested_with_constant_queries(self):
+        """Test a thread comes back nested, limited by ?depth="""
+        root = self._reply(text="Root")
+        parent = root
+        for level in range(5):
+            parent = self._reply(parent, text=f"Level{level}")
+        sibling = self._reply(root, text="Sibling")
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(thread_url(root.id))
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries.captured_queries), 3)
+        self.assertEqual(res.data["reply_count"], 6)
+        self.assertEqual(
+            [reply["id"] for reply in res.data["replies"]][-1], sibling.id
+        )
+        node, levels = res.data, 0
+        while node["replies"]:
+            node, levels = node["replies"][0], levels + 1
+        self.assertEqual(levels, 5)
+        self.assertEqual(node["username"], "Admin_user")
+
+        res = self.client.get(thread_url(root.id), {"depth": 1})
+        self.assertEqual(len(res.data["replies"]), 2)
+        self.assertEqual(res.data["replies"][0]["replies"], [])
+
+    def test_reply_to_other_post_rejected(self):
+        """Test a reply must belong to the post of its parent"""
+        other = Post.objects.create(
+            user=self.user,
+            title="Other",
+            scheduled_publish_time=timezone.now(),
+        )
+        root = self._reply()
+
+        res = self.client.post(COMMENTS_URL, {
+            "comment": "Reply",
+            "post": other.id,
+            "parent": root.id,
+        })
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,161 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media.models import Comment, Profile, Post
+from media.redis_client import get_redis
+
+
+POSTS_URL = reverse("media:post-list")
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, username="Admin_user"
+        )
+        author = get_user_model().objects.create_user(
+            email="author@test.com",
+            password="test_password12"
+        )
+        self.author_profile = Profile.objects.create(
+            user=author, username="Author"
+        )
+        self.posts = [
+            Post.objects.create(
+                user=author,
+                title=f"Post{i}",
+                scheduled_publish_time=timezone.now(),
+                is_published=True,
+            )
+            for i in range(2)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _assert_not_modified(self, url, etag, queries=1):
+        with self.assertNumQueries(queries):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+    def test_post_detail_not_modified_until_reaction(self):
+        """Test post detail 304s until a reaction changes its counters"""
+        url = reverse("media:post-detail", args=[self.posts[0].id])
+        res = self.client.get(url)
+        self.assertIn("Last-Modified", res)
+        self._assert_not_modified(url, res["ETag"])
+
+        res_since = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=res["Last-Modified"]
+        )
+        self.assertEqual(
+            res_since.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+        self.client.post(
+            reverse("media:reactions-list"),
+            {"post": self.posts[0].id, "reaction": "L"}
+        )
+        res_changed = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res_changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res_changed["ETag"], res["ETag"])
+
+    def test_post_list_etag_follows_additions_and_deletions(self):
+        """Test post list ETags change when posts are added or removed"""
+        res = self.client.get(POSTS_URL)
+        self.assertNotIn("Last-Modified", res)
+        self._assert_not_modified(POSTS_URL, res["ETag"], queries=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.posts[0].delete()
+        res_deleted = self.client.get(
+            POSTS_URL, HTTP_IF_NONE_MATCH=res["ETag"]
+        )
+        self.assertEqual(res_deleted.status_code, status.HTTP_200_OK)
+
+        self.author_profile.username = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author_profile.save()
+        res_renamed = self.client.get(
+            POSTS_URL, HTTP_IF_NONE_MATCH=res_deleted["ETag"]
+        )
+        self.assertEqual(res_renamed.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res_renamed.data["results"][0]["username"], "Renamed"
+        )
+
+    def test_profile_and_comments_etags(self):
+        """Test following and commenting produce new ETags"""
+        profile_url = reverse("media:profile-detail", args=[self.user.id])
+        res = self.client.get(profile_url)
+        self._assert_not_modified(profile_url, res["ETag"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author_profile)
+        res = self.client.get(profile_url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.data["following"], ["author@test.com"])
+
+        comments_url = reverse(
+            "media:post-comments", args=[self.posts[0].id]
+        )
+        res = self.client.get(comments_url)
+        self._assert_not_modified(comments_url, res["ETag"], queries=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                user=self.user, post=self.posts[0], comment="Hello"
+            )
+        res = self.client.get(comments_url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_comments_etag_is_scoped_to_its_post(self):
+        """Test comments of one post keep 304ing when other posts change"""
+        url = reverse("media:post-comments", args=[self.posts[0].id])
+        res = self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                user=self.user, post=self.posts[1], comment="Elsewhere"
+            )
+        self._assert_not_modified(url, res["ETag"], queries=0)
+
+        get_redis().flushdb()
+        res_expired = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res_expired.status_code, status.HTTP_200_OK)
+
+        self.profile.username = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.save()
+        self._assert_not_modified(url, res_expired["ETag"], queries=0)
+
+    def test_all_comments_etag_follows_deleted_comments(self):
+        """Test removing a comment changes the ETag of the whole thread"""
+        comments = [
+            Comment.objects.create(
+                user=self.user, post=self.posts[0], comment=f"Hello{i}"
+            )
+            for i in range(2)
+        ]
+        url = reverse("media:all-comments-detail", args=[self.posts[0].id])
+        res = self.client.get(url)
+        self.assertNotIn("Last-Modified", res)
+        self._assert_not_modified(url, res["ETag"])
+
+        comments[0].delete()
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_conditional_mixins_add_no_routes(self):
+        """Test the all-comments view keeps its retrieve-only routes"""
+        with self.assertRaises(NoReverseMatch):
+            reverse("media:all-comments-list")
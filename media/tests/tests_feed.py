@@ -0,0 +1,223 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media import metrics
+from media.models import Profile, Post
+from media.feed import PULL_AUTHORS_KEY, timeline_key
+from media.redis_client import get_redis
+from media.tasks import publishing_post
+
+
+FEED_URL = reverse("media:feed")
+METRICS_URL = reverse("media:metrics")
+
+
+def sample_profile(email, username):
+    user = get_user_model().objects.create_user(
+        email=email,
+        password="test_password12"
+    )
+    return Profile.objects.create(user=user, username=username)
+
+
+def set_follow_url(user_id):
+    return reverse("media:set-follow", args=[user_id])
+
+
+def unfollow_url(user_id):
+    return reverse("media:unfollow", args=[user_id])
+
+
+class FeedTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.reader = sample_profile("reader@test.com", "reader")
+        self.author = sample_profile("author@test.com", "author")
+        self.stranger = sample_profile("stranger@test.com", "stranger")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.reader.user)
+
+    def _publish(self, profile, title, minutes_ago=0):
+        post = Post.objects.create(
+            user=profile.user,
+            title=title,
+            scheduled_publish_time=(
+                timezone.now() - timezone.timedelta(minutes=minutes_ago)
+            ),
+        )
+        publishing_post()
+        return post
+
+    def test_feed_contains_followed_posts_newest_first(self):
+        """Test published posts are pushed to followers' timelines"""
+        self.client.post(set_follow_url(self.author.user_id))
+        older = self._publish(self.author, "Older", minutes_ago=5)
+        newer = self._publish(self.author, "Newer")
+        self._publish(self.stranger, "Not followed")
+
+        res = self.client.get(FEED_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]],
+            [newer.id, older.id]
+        )
+
+    def test_follow_backfills_and_unfollow_removes_posts(self):
+        """Test following merges recent posts and unfollowing drops them"""
+        post = self._publish(self.author, "Before follow")
+
+        self.client.post(set_follow_url(self.author.user_id))
+        res = self.client.get(FEED_URL)
+        self.assertEqual([p["id"] for p in res.data["results"]], [post.id])
+
+        self.client.post(unfollow_url(self.author.user_id))
+        res = self.client.get(FEED_URL)
+        self.assertEqual(res.data["results"], [])
+
+    def test_feed_pagination(self):
+        """Test feed pages with offset and limit"""
+        self.client.post(set_follow_url(self.author.user_id))
+        posts = [
+            self._publish(self.author, f"Post{i}", minutes_ago=10 - i)
+            for i in range(3)
+        ]
+
+        res = self.client.get(FEED_URL, {"limit": 2})
+        self.assertEqual(
+            [p["id"] for p in res.data["results"]],
+            [posts[2].id, posts[1].id]
+        )
+        self.assertIsNotNone(res.data["next"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual([p["id"] for p in res.data["results"]], [posts[0].id])
+        self.assertIsNone(res.data["next"])
+
+    def test_feed_rebuilt_when_timeline_is_missing(self):
+        """Test a lost timeline is rebuilt from the following graph"""
+        self.client.post(set_follow_url(self.author.user_id))
+        post = self._publish(self.author, "Post")
+        get_redis().flushdb()
+
+        res = self.client.get(FEED_URL)
+
+        self.assertEqual([p["id"] for p in res.data["results"]], [post.id])
+
+    def test_publish_skips_timelines_not_built(self):
+        """Test a push never leaves a partial timeline hiding older posts"""
+        self.client.post(set_follow_url(self.author.user_id))
+        older = self._publish(self.author, "Older", minutes_ago=5)
+        get_redis().flushdb()
+        newer = self._publish(self.author, "Newer")
+
+        self.assertFalse(get_redis().exists(timeline_key(self.reader.user_id)))
+        res = self.client.get(FEED_URL)
+        self.assertEqual(
+            [p["id"] for p in res.data["results"]], [newer.id, older.id]
+        )
+
+
+@override_settings(FEED_FAN_OUT_FOLLOWER_THRESHOLD=1)
+class HybridFeedTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.reader = sample_profile("reader@test.com", "reader")
+        self.fan = sample_profile("fan@test.com", "fan")
+        self.star = sample_profile("star@test.com", "star")
+        self.author = sample_profile("author@test.com", "author")
+        self.reader.following.add(self.star, self.author)
+        self.fan.following.add(self.star)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.reader.user)
+
+    def test_high_follower_posts_are_merged_at_read_time(self):
+        """Test authors above the threshold are pulled, not pushed"""
+        old_post = Post.objects.create(
+            user=self.author.user,
+            title="Old",
+            scheduled_publish_time=(
+                timezone.now() - timezone.timedelta(minutes=10)
+            ),
+        )
+        publishing_post()
+        self.client.get(FEED_URL)
+        post_time = timezone.now() - timezone.timedelta(minutes=5)
+        author_post = Post.objects.create(
+            user=self.author.user,
+            title="Pushed",
+            scheduled_publish_time=post_time,
+        )
+        star_post = Post.objects.create(
+            user=self.star.user,
+            title="Pulled",
+            scheduled_publish_time=timezone.now(),
+        )
+        publishing_post()
+
+        self.assertEqual(
+            get_redis().zrange(timeline_key(self.reader.user_id), 0, -1),
+            [str(old_post.id), str(author_post.id)]
+        )
+        res = self.client.get(FEED_URL)
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]],
+            [star_post.id, author_post.id, old_post.id]
+        )
+
+    def test_fan_out_counts_are_shared_through_redis(self):
+        """Test counts made by the publishing task reach the metrics view"""
+        Post.objects.create(
+            user=self.author.user, title="Old", is_published=True
+        )
+        self.client.get(FEED_URL)
+        for user in (self.star.user, self.author.user):
+            Post.objects.create(
+                user=user, title="Post", scheduled_publish_time=timezone.now()
+            )
+        publishing_post()
+
+        self.assertEqual(metrics.FEED_PULL_POSTS.get(), 1)
+        self.assertEqual(metrics.FEED_TIMELINE_WRITES.get(), 2)
+        staff = get_user_model().objects.create_user(
+            email="staff@test.com", password="test_password12", is_staff=True
+        )
+        self.client.force_authenticate(user=staff)
+        res = self.client.get(METRICS_URL)
+        self.assertIn(b"feed_pull_posts_total 1.0", res.content)
+        self.assertIn(b"feed_timeline_writes_total 2.0", res.content)
+
+    def test_pull_posts_are_pushed_when_author_leaves_pull_mode(self):
+        """Test posts made in pull mode stay in feeds after the switch"""
+        pulled = Post.objects.create(
+            user=self.star.user,
+            title="Pulled",
+            scheduled_publish_time=timezone.now(),
+        )
+        publishing_post()
+        self.client.get(FEED_URL)
+        self.fan.following.remove(self.star)
+
+        pushed = Post.objects.create(
+            user=self.star.user,
+            title="Pushed",
+            scheduled_publish_time=timezone.now(),
+        )
+        publishing_post()
+
+        self.assertFalse(get_redis().smembers(PULL_AUTHORS_KEY))
+        self.assertEqual(
+            set(get_redis().zrange(timeline_key(self.reader.user_id), 0, -1)),
+            {str(pulled.id), str(pushed.id)}
+        )
+        res = self.client.get(FEED_URL)
+        self.assertEqual(
+            [post["id"] for post in res.data["results"]],
+            [pushed.id, pulled.id]
+        )
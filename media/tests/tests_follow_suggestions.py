@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from media import suggestions
+from media.models import Profile
+from media.redis_client import get_redis
+
+SUGGESTIONS_URL = reverse("media:follow-suggestions")
+
+
+class FollowSuggestionsTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.profiles = []
+        for i in range(6):
+            user = get_user_model().objects.create_user(
+                email=f"user{i}@test.com",
+                password="test_password12"
+            )
+            self.profiles.append(
+                Profile.objects.create(user=user, username=f"User_{i}")
+            )
+        self.ids = [profile.user_id for profile in self.profiles]
+        me, first, second, third, fourth, _ = self.profiles
+        # me -> first, second; both follow third, only second follows
+        # fourth; first follows me back
+        me.following.add(first, second)
+        first.following.add(third, me)
+        second.following.add(third, fourth)
+
+    def test_compute_ranks_friends_of_friends(self):
+        """Test candidates are ranked by shared connections"""
+        me, first, second, third, fourth, _ = self.ids
+
+        stored = suggestions.compute(chunk_size=2)
+
+        self.assertEqual(stored, 2)
+        self.assertEqual(
+            suggestions.get_suggestions(me), [(third, 2), (fourth, 1)]
+        )
+        self.assertEqual(
+            suggestions.get_suggestions(first), [(second, 1)]
+        )
+        self.assertEqual(suggestions.get_suggestions(second), [])
+
+    def test_compute_keeps_top_k(self):
+        """Test only the best candidates are stored"""
+        suggestions.compute(top_k=1)
+        self.assertEqual(
+            suggestions.get_suggestions(self.ids[0]), [(self.ids[3], 2)]
+        )
+
+    def test_suggestions_endpoint(self):
+        """Test suggestions skip accounts followed after the computation"""
+        me, _, _, third, fourth, _ = self.profiles
+        suggestions.compute()
+        client = APIClient()
+        client.force_authenticate(user=me.user)
+
+        with self.assertNumQueries(1):
+            res = client.get(SUGGESTIONS_URL)
+        self.assertEqual(
+            [(row["user_id"], row["shared_connections"]) for row in res.data],
+            [(third.user_id, 2), (fourth.user_id, 1)]
+        )
+        self.assertEqual(res.data[0]["username"], "User_3")
+        self.assertEqual(res.data[0]["follower_count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            me.following.add(third)
+        res = client.get(SUGGESTIONS_URL, {"limit": 5})
+        self.assertEqual(
+            [row["user_id"] for row in res.data], [fourth.user_id]
+        )
+
+    def test_suggestions_before_computation(self):
+        """Test an empty list is returned until suggestions are computed"""
+        client = APIClient()
+        client.force_authenticate(user=self.profiles[5].user)
+
+        res = client.get(SUGGESTIONS_URL)
+
+        self.assertEqual(res.data, [])
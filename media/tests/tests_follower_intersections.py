@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media.models import Profile
+
+MUTUAL_URL = reverse("media:my-mutual-follows")
+NOT_FOLLOWED_BACK_URL = reverse("media:my-followers-not-followed-back")
+
+
+def shared_followers_url(user_id):
+    return reverse("media:shared-followers", args=[user_id])
+
+
+class FollowerIntersectionTests(TestCase):
+
+    def setUp(self) -> None:
+        self.profiles = []
+        for i in range(7):
+            user = get_user_model().objects.create_user(
+                email=f"user{i}@test.com",
+                password="test_password12"
+            )
+            self.profiles.append(
+                Profile.objects.create(user=user, username=f"User_{i}")
+            )
+        self.me, self.other = self.profiles[0], self.profiles[1]
+        self.ids = [profile.user_id for profile in self.profiles]
+        # profiles 2-6 follow me, I follow 2, 4, 5, 6 back and 1;
+        # 2 and 3 also follow profile 1
+        for follower in self.profiles[2:]:
+            follower.following.add(self.me)
+        self.me.following.add(
+            self.other, *[self.profiles[i] for i in (2, 4, 5, 6)]
+        )
+        self.profiles[2].following.add(self.other)
+        self.profiles[3].following.add(self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.me.user)
+
+    def _ids(self, res):
+        return [profile["user_id"] for profile in res.data["results"]]
+
+    def test_mutual_follows_paginated_by_id(self):
+        """Test mutual follows come in id order across cursor pages"""
+        res = self.client.get(MUTUAL_URL, {"page_size": 3})
+        self.assertEqual(self._ids(res), [self.ids[i] for i in (2, 4, 5)])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(self._ids(res), [self.ids[6]])
+        self.assertIsNone(res.data["next"])
+        self.assertEqual(res.data["results"][0]["username"], "User_6")
+
+    def test_followers_not_followed_back(self):
+        """Test only followers the user does not follow are listed"""
+        res = self.client.get(NOT_FOLLOWED_BACK_URL)
+        self.assertEqual(self._ids(res), [self.ids[3]])
+
+    def test_shared_followers(self):
+        """Test followers of both the user and another profile"""
+        res = self.client.get(shared_followers_url(self.other.user_id))
+        self.assertEqual(self._ids(res), [self.ids[2], self.ids[3]])
+
+        res = self.client.get(shared_followers_url(999999))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_query_count(self):
+        """Test a page is one id query plus the profiles and their follows"""
+        with self.assertNumQueries(3):
+            self.client.get(MUTUAL_URL)
@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media.hashtags import parse_hashtags
+from media.models import Profile, Post, Hashtag
+
+
+POSTS_URL = reverse("media:post-list")
+HASHTAGS_URL = reverse("media:hashtag-list")
+
+
+def tag_posts_url(name):
+    return reverse("media:hashtag-posts", args=[name])
+
+
+class HashtagTests(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=self.user, username="Admin_user")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _post(self, hashtag):
+        return Post.objects.create(
+            user=self.user,
+            title="Post",
+            hashtag=hashtag,
+            scheduled_publish_time=timezone.now(),
+            is_published=True,
+        )
+
+    def test_parse_hashtags(self):
+        """Test hashtags are split, normalized and deduplicated"""
+        self.assertEqual(
+            parse_hashtags("#Art, #summer trip #ART"),
+            ["art", "summer", "trip"]
+        )
+        self.assertEqual(parse_hashtags(None), [])
+
+    def test_filter_by_exact_tag(self):
+        """Test ?hashtag=art does not match #party"""
+        art = self._post("#Art #friends")
+        self._post("#party")
+
+        res = self.client.get(POSTS_URL, {"hashtag": "#art"})
+
+        self.assertEqual([p["id"] for p in res.data["results"]], [art.id])
+
+    def test_posts_by_tag_newest_first(self):
+        """Test tag posts endpoint pages newest posts first"""
+        first = self._post("#travel")
+        second = self._post("#travel #sea")
+        first.hashtag = "#sea"
+        first.save()
+
+        res = self.client.get(tag_posts_url("TRAVEL"))
+        self.assertEqual([p["id"] for p in res.data["results"]], [second.id])
+
+        res = self.client.get(tag_posts_url("sea"), {"page_size": 1})
+        self.assertEqual([p["id"] for p in res.data["results"]], [second.id])
+        res = self.client.get(res.data["next"])
+        self.assertEqual([p["id"] for p in res.data["results"]], [first.id])
+
+    def test_tag_list_shows_published_tags_only(self):
+        """Test tags used only by unpublished posts are not listed"""
+        self._post("#art #sea")
+        Post.objects.create(
+            user=self.user,
+            title="Draft",
+            hashtag="#sea #secret",
+            scheduled_publish_time=timezone.now() + timezone.timedelta(days=1),
+        )
+
+        res = self.client.get(HASHTAGS_URL)
+
+        self.assertEqual(
+            [tag["name"] for tag in res.data["results"]], ["art", "sea"]
+        )
+
+    def test_backfill_command(self):
+        """Test existing posts are indexed in batches"""
+        Post.objects.bulk_create([
+            Post(user=self.user, title=f"Old{i}", hashtag=f"#old #n{i}")
+            for i in range(5)
+        ])
+        self.assertFalse(Hashtag.objects.exists())
+
+        call_command("backfill_hashtags", batch_size=2, stdout=StringIO())
+
+        self.assertEqual(Hashtag.objects.get(name="old").posts.count(), 5)
+        self.assertEqual(Hashtag.objects.count(), 6)
@@ -0,0 +1,177 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from media import image_variants
+from media.models import Post, Profile
+from media.redis_client import get_redis
+from media.row_serializers import PostListRowSerializer
+from media.serializers import PostListSerializer
+from media.tasks import generate_image_variants
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def sample_image(name="photo.png", size=(1200, 900), image_format="PNG"):
+    output = BytesIO()
+    mode = "RGB" if image_format == "JPEG" else "RGBA"
+    Image.new(mode, size, "red").save(
+        output, format=image_format
+    )
+    return SimpleUploadedFile(name, output.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ImageVariantTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.user = get_user_model().objects.create_user(
+            email="author@test.com",
+            password="test_password12"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, username="Author"
+        )
+        self.post = Post.objects.create(
+            user=self.user,
+            title="Title",
+            message="Message",
+            scheduled_publish_time=timezone.now(),
+            is_published=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _upload_post_image(self, image):
+        return self.client.post(
+            reverse("media:post-upload-image", args=[self.post.id]),
+            {"image": image},
+            format="multipart"
+        )
+
+    def test_upload_returns_before_resizing(self):
+        """Test variants are made only after the upload is committed"""
+        with self.captureOnCommitCallbacks() as callbacks:
+            res = self._upload_post_image(sample_image())
+        self.post.refresh_from_db()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self.post.image_variants, {})
+
+        for callback in callbacks:
+            callback()
+        self.post.refresh_from_db()
+        self.assertEqual(
+            set(self.post.image_variants), set(image_variants.VARIANTS)
+        )
+
+    def test_upload_enqueues_task_on_commit(self):
+        """Test the upload hands the resize to Celery, not the request"""
+        with mock.patch.object(generate_image_variants, "delay") as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._upload_post_image(sample_image())
+                delay.assert_not_called()
+
+        self.post.refresh_from_db()
+        delay.assert_called_once_with(
+            "media.post", self.post.id, self.post.image.name
+        )
+        self.assertEqual(self.post.image_variants, {})
+        stem = self.post.image.name.rsplit(".", 1)[0]
+        self.assertFalse(
+            self.post.image.storage.exists(f"{stem}-thumbnail.png")
+        )
+
+    def test_variants_are_resized_next_to_the_original(self):
+        """Test thumbnail, medium and WebP files fit their boxes"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self._upload_post_image(sample_image())
+        self.post.refresh_from_db()
+        stem = self.post.image.name.rsplit(".", 1)[0]
+        variants = self.post.image_variants
+        self.assertEqual(variants["thumbnail"], f"{stem}-thumbnail.png")
+        self.assertEqual(variants["webp"], f"{stem}-webp.webp")
+
+        expected = {
+            "thumbnail": ((150, 113), "PNG"),
+            "medium": ((800, 600), "PNG"),
+            "webp": ((800, 600), "WEBP"),
+        }
+        storage = self.post.image.storage
+        for name, (size, image_format) in expected.items():
+            with storage.open(variants[name]) as variant:
+                image = Image.open(variant)
+                self.assertEqual(image.size, size)
+                self.assertEqual(image.format, image_format)
+
+    def test_variants_map_in_post_responses(self):
+        """Test post responses and row serializer show the same URLs"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self._upload_post_image(sample_image())
+
+        res = self.client.get(
+            reverse("media:post-detail", args=[self.post.id])
+        )
+
+        variants = res.data["variants"]
+        self.assertTrue(
+            variants["webp"].startswith("http://testserver/media_files/")
+        )
+        request = res.wsgi_request
+        posts = Post.objects.filter(id=self.post.id)
+        row_serializer = PostListRowSerializer(context={"request": request})
+        self.assertEqual(
+            row_serializer.many(row_serializer.values(posts)),
+            PostListSerializer(
+                posts, many=True, context={"request": request}
+            ).data
+        )
+
+    def test_profile_pic_variants(self):
+        """Test profile pictures get variants shown by the profile"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("media:profile-upload-image", args=[self.user.id]),
+                {"profile_pic": sample_image("me.jpg", image_format="JPEG")},
+                format="multipart"
+            )
+
+        res = self.client.get(
+            reverse("media:profile-detail", args=[self.user.id])
+        )
+
+        variants = res.data["variants"]
+        self.assertEqual(set(variants), {"thumbnail", "medium", "webp"})
+        self.assertTrue(variants["medium"].endswith("-medium.jpg"))
+
+    def test_superseded_upload_keeps_no_variants(self):
+        """Test variants of a replaced image are dropped"""
+        with self.captureOnCommitCallbacks():
+            self._upload_post_image(sample_image())
+        self.post.refresh_from_db()
+        old_name = self.post.image.name
+        with self.captureOnCommitCallbacks():
+            self._upload_post_image(sample_image("new.png"))
+
+        names = image_variants.generate("media.post", self.post.id, old_name)
+
+        self.assertEqual(names, {})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.image_variants, {})
+        storage = self.post.image.storage
+        stem = old_name.rsplit(".", 1)[0]
+        self.assertFalse(storage.exists(f"{stem}-thumbnail.png"))
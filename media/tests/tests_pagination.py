@@ -0,0 +1,156 @@
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media.models import Comment, Profile, Post
+
+
+POSTS_URL = reverse("media:post-list")
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self) -> None:
+        user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=user, username="Admin_user")
+        publish_time = timezone.now() - timezone.timedelta(hours=1)
+        self.posts = [
+            Post.objects.create(
+                user=user,
+                title=f"Post{i}",
+                scheduled_publish_time=publish_time,
+                is_published=True,
+            )
+            for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+    @staticmethod
+    def _ids(res):
+        return [post["id"] for post in res.data["results"]]
+
+    def test_cursor_walks_forward_and_back_without_count(self):
+        """Test next/previous cursors over posts with equal publish time"""
+        ids = [post.id for post in self.posts]
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(POSTS_URL, {"page_size": 2})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", res.data)
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+        self.assertEqual(self._ids(res), ids[:2])
+        self.assertIsNone(res.data["previous"])
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(self._ids(res), ids[2:4])
+        res = self.client.get(res.data["next"])
+        self.assertEqual(self._ids(res), ids[4:])
+        self.assertIsNone(res.data["next"])
+
+        res = self.client.get(res.data["previous"])
+        self.assertEqual(self._ids(res), ids[2:4])
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor is rejected"""
+        res = self.client.get(POSTS_URL, {"cursor": "not-a-cursor"})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_typed_values(self):
+        """Test a well-formed cursor holding bad values is rejected"""
+        for position in (
+                ["yesterday", 1],
+                [self.posts[0].scheduled_publish_time.isoformat(), "x"],
+                [5, 1],
+                [None, {"id": 1}],
+        ):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps({"r": 0, "p": position}).encode()
+            ).decode()
+
+            res = self.client.get(POSTS_URL, {"cursor": cursor})
+
+            self.assertEqual(
+                res.status_code, status.HTTP_404_NOT_FOUND, position
+            )
+
+    def test_legacy_page_number_mode(self):
+        """Test ?page= keeps page-number responses for legacy clients"""
+        res = self.client.get(POSTS_URL, {"page": 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["count"], 5)
+        self.assertEqual(len(res.data["results"]), 5)
+
+
+class PostCommentsPaginationTests(TestCase):
+
+    def setUp(self) -> None:
+        self.users = []
+        for i in range(3):
+            user = get_user_model().objects.create_user(
+                email=f"test{i}@test.com",
+                password="test_password12"
+            )
+            Profile.objects.create(user=user, username=f"User_{i}")
+            self.users.append(user)
+        self.post = Post.objects.create(
+            user=self.users[0],
+            title="Post",
+            scheduled_publish_time=timezone.now(),
+            is_published=True,
+        )
+        self.comments = [
+            Comment.objects.create(
+                user=self.users[i % 3], post=self.post, comment=f"C{i}"
+            )
+            for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.users[0])
+
+    def test_comments_walk_with_batched_usernames(self):
+        """Test comment pages use cursors and one username query"""
+        url = reverse("media:post-comments", args=[self.post.id])
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url, {"page_size": 3})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries.captured_queries), 2)
+        self.assertEqual(
+            [comment["id"] for comment in res.data["results"]],
+            [comment.id for comment in self.comments[:3]]
+        )
+        self.assertEqual(
+            [comment["username"] for comment in res.data["results"]],
+            ["User_0", "User_1", "User_2"]
+        )
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(
+            [comment["id"] for comment in res.data["results"]],
+            [comment.id for comment in self.comments[3:]]
+        )
+        self.assertIsNone(res.data["next"])
+
+    def test_comments_of_missing_post(self):
+        """Test comments of an unknown post return 404"""
+        url = reverse("media:post-comments", args=[self.post.id + 1])
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
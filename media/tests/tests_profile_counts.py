@@ -0,0 +1,133 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media.models import Post, Profile
+from media.redis_client import get_redis
+from media.tasks import (
+    publish_scheduled_post,
+    publishing_post,
+    reconcile_profile_counts,
+)
+
+
+class ProfileCountTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.profiles = []
+        for i in range(3):
+            user = get_user_model().objects.create_user(
+                email=f"user{i}@test.com",
+                password="test_password12"
+            )
+            self.profiles.append(
+                Profile.objects.create(user=user, username=f"User_{i}")
+            )
+
+    def _counts(self, profile):
+        profile.refresh_from_db()
+        return (
+            profile.follower_count,
+            profile.following_count,
+            profile.post_count,
+        )
+
+    def test_follow_counts_follow_m2m_changes(self):
+        """Test add, remove and clear from both sides keep counts exact"""
+        first, second, third = self.profiles
+        first.following.add(second, third)
+        first.following.add(second)
+        third.followers.add(second)
+        self.assertEqual(self._counts(first), (0, 2, 0))
+        self.assertEqual(self._counts(second), (1, 1, 0))
+        self.assertEqual(self._counts(third), (2, 0, 0))
+
+        first.following.remove(second, second.pk + 100)
+        first.following.remove(second)
+        self.assertEqual(self._counts(first), (0, 1, 0))
+        self.assertEqual(self._counts(second), (0, 1, 0))
+
+        third.followers.clear()
+        self.assertEqual(self._counts(first), (0, 0, 0))
+        self.assertEqual(self._counts(second), (0, 0, 0))
+        self.assertEqual(self._counts(third), (0, 0, 0))
+
+    def test_post_count_follows_published_posts(self):
+        """Test only published posts of the author are counted"""
+        user = self.profiles[0].user
+        post = Post.objects.create(
+            user=user, title="Title", message="Text", is_published=True
+        )
+        Post.objects.create(user=user, title="Title", message="Text")
+        post.title = "Edited"
+        post.save()
+        self.assertEqual(self._counts(self.profiles[0]), (0, 0, 1))
+
+        post.delete()
+        self.assertEqual(self._counts(self.profiles[0]), (0, 0, 0))
+
+    def test_post_count_follows_publishing(self):
+        """Test scheduled posts are counted once they are published"""
+        user = self.profiles[0].user
+        now = timezone.now()
+        due = Post.objects.create(
+            user=user, title="Due", scheduled_publish_time=now
+        )
+        Post.objects.create(
+            user=user,
+            title="Later",
+            scheduled_publish_time=now + timezone.timedelta(hours=1)
+        )
+        scheduled = Post.objects.create(
+            user=user, title="Scheduled", scheduled_publish_time=now
+        )
+        self.assertEqual(self._counts(self.profiles[0]), (0, 0, 0))
+
+        self.assertTrue(publish_scheduled_post(scheduled.id, now.isoformat()))
+        self.assertEqual(self._counts(self.profiles[0]), (0, 0, 1))
+        self.assertEqual(publishing_post(), [due.id])
+        self.assertEqual(self._counts(self.profiles[0]), (0, 0, 2))
+
+        Post.objects.get(id=due.id).delete()
+        self.assertEqual(self._counts(self.profiles[0]), (0, 0, 1))
+
+    def test_reconcile_profile_counts(self):
+        """Test reconciliation fixes drifted counters only"""
+        first, second, _ = self.profiles
+        first.following.add(second)
+        Post.objects.create(
+            user=first.user, title="Title", message="Text", is_published=True
+        )
+        Post.objects.create(user=first.user, title="Draft", message="Text")
+        Profile.objects.filter(pk=first.pk).update(
+            following_count=5, post_count=0
+        )
+        Profile.objects.filter(pk=second.pk).update(follower_count=0)
+
+        self.assertEqual(reconcile_profile_counts(batch_size=2), 2)
+        self.assertEqual(self._counts(first), (0, 1, 1))
+        self.assertEqual(self._counts(second), (1, 0, 0))
+        self.assertEqual(reconcile_profile_counts(), 0)
+
+    def test_counts_in_profile_response(self):
+        """Test the profile response shows the counts"""
+        first, second, _ = self.profiles
+        client = APIClient()
+        client.force_authenticate(user=first.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            first.following.add(second)
+
+        res = client.get(reverse("media:profile-detail", args=[second.pk]))
+
+        self.assertEqual(res.data["follower_count"], 1)
+        self.assertEqual(res.data["following_count"], 0)
+        self.assertEqual(res.data["post_count"], 0)
+
+        client.patch(
+            reverse("media:profile-detail", args=[first.pk]),
+            {"follower_count": 100}
+        )
+        self.assertEqual(self._counts(first), (0, 1, 0))
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from media.models import Profile
+from media.views import ProfileViewSet
+
+
+PROFILES_URL = reverse("media:profile-list")
+
+
+def sample_profile(username, bio=None):
+    user = get_user_model().objects.create_user(
+        email=f"{username}@test.com",
+        password="test_password12"
+    )
+    return Profile.objects.create(user=user, username=username, bio=bio)
+
+
+class ProfileSearchTests(TestCase):
+
+    def setUp(self) -> None:
+        self.antonio = sample_profile("antonio", "Street photographer")
+        self.anton = sample_profile("anton", "Mountain photographer")
+        self.maria = sample_profile("maria", "Baker")
+        self.anton.following.add(self.maria)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.maria.user)
+
+    def _search(self, **params):
+        res = self.client.get(PROFILES_URL, params)
+        return [profile["username"] for profile in res.data["results"]]
+
+    def test_username_search_is_fuzzy_and_ranked(self):
+        """Test typos still match and closer usernames come first"""
+        self.assertEqual(self._search(username="anton"), ["anton", "antonio"])
+        self.assertIn("anton", self._search(username="antonn"))
+
+    def test_combined_filters(self):
+        """Test username, bio and following filters are combined"""
+        self.assertEqual(
+            self._search(username="anton", bio="mountain"),
+            ["anton"]
+        )
+        self.assertEqual(
+            self._search(username="anton", following=self.maria.user_id),
+            ["anton"]
+        )
+        self.assertEqual(
+            self._search(following=self.maria.user_id),
+            ["anton"]
+        )
+
+    def test_search_uses_trigram_indexes(self):
+        """Test username and bio filters are served by their GIN indexes"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)",
+                [["profile_username_trgm_idx", "profile_bio_trgm_idx"]]
+            )
+            if cursor.rowcount != 2:
+                self.skipTest("pg_trgm GIN operator classes unavailable")
+
+        request = APIRequestFactory().get(
+            PROFILES_URL, {"username": "anton", "bio": "mountain"}
+        )
+        view = ProfileViewSet(request=Request(request), action=None)
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Three rows are cheaper to scan, so rule that out
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = view.get_queryset().explain()
+
+        self.assertNotIn("Seq Scan on media_profile ", plan)
+        self.assertIn("profile_username_trgm_idx", plan)
+        self.assertIn("profile_bio_trgm_idx", plan)
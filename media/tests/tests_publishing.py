@@ -0,0 +1,237 @@
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media import feed, publishing, trending
+from media.models import Post, Profile
+from media.redis_client import get_redis
+from media.tasks import publish_scheduled_post, publishing_post
+
+POSTS_URL = reverse("media:post-list")
+
+
+class PublishingPostTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.author = get_user_model().objects.create_user(
+            email="author@test.com",
+            password="test_password12"
+        )
+        self.reader = get_user_model().objects.create_user(
+            email="reader@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=self.author, username="Author")
+        Profile.objects.create(
+            user=self.reader, username="Reader"
+        ).following.add(self.author.profile)
+        self.now = timezone.now()
+
+    def _post(self, minutes, **params):
+        return Post.objects.create(
+            user=self.author,
+            title="Title",
+            message="Message",
+            hashtag="#news",
+            scheduled_publish_time=self.now + timezone.timedelta(
+                minutes=minutes
+            ),
+            **params
+        )
+
+    def test_publishes_due_posts_in_chunks(self):
+        """Test due posts are flipped oldest first and their ids returned"""
+        second = self._post(-5)
+        first = self._post(-10)
+        future = self._post(10)
+        unscheduled = Post.objects.create(
+            user=self.author, title="Title", message="Message"
+        )
+
+        published_ids = publishing_post(batch_size=1)
+
+        self.assertEqual(published_ids, [first.id, second.id])
+        self.assertEqual(
+            set(
+                Post.objects.filter(is_published=True)
+                .values_list("id", flat=True)
+            ),
+            {first.id, second.id}
+        )
+        self.assertEqual(publishing_post(), [])
+        for post in (future, unscheduled):
+            post.refresh_from_db()
+            self.assertFalse(post.is_published)
+
+    def test_published_posts_are_not_rewritten(self):
+        """Test already published posts keep their row untouched"""
+        old = self._post(-60, is_published=True)
+        updated_at = Post.objects.get(id=old.id).updated_at
+        due = self._post(-1)
+
+        self.assertEqual(publishing_post(), [due.id])
+        self.assertEqual(Post.objects.get(id=old.id).updated_at, updated_at)
+
+    def test_published_ids_feed_timelines_and_trending(self):
+        """Test flipped posts reach followers' timelines and trending"""
+        due = self._post(-1)
+
+        publishing_post()
+
+        self.assertEqual(feed.read_timeline(self.reader.id, 0, 10), [due.id])
+        trending.compact()
+        self.assertEqual(
+            trending.top_hashtags("hour", 10),
+            [{"name": "news", "count": 1}]
+        )
+
+
+class ScheduledPublishTaskTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.user = get_user_model().objects.create_user(
+            email="author@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=self.user, username="Author")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _create(self, publish_time):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                POSTS_URL,
+                {
+                    "title": "Title",
+                    "message": "Message",
+                    "hashtag": "#news",
+                    "scheduled_publish_time": publish_time.isoformat(),
+                },
+            )
+        return Post.objects.get(id=res.data["id"])
+
+    def test_create_enqueues_eta_task(self):
+        """Test a created post gets a publish task for its time"""
+        publish_time = timezone.now() + timezone.timedelta(minutes=10)
+        with mock.patch.object(
+                publish_scheduled_post, "apply_async"
+        ) as apply_async:
+            apply_async.return_value.id = "task-1"
+            post = self._create(publish_time)
+
+        apply_async.assert_called_once_with(
+            (post.id, publish_time.isoformat()), eta=publish_time
+        )
+        self.assertEqual(
+            get_redis().hget(publishing.eta_key(post.id), "task_id"),
+            "task-1"
+        )
+
+    def test_far_post_is_enqueued_by_the_sweep(self):
+        """Test posts beyond the ETA window get their task from the sweep"""
+        publish_time = timezone.now() + timezone.timedelta(hours=2)
+        with mock.patch.object(
+                publish_scheduled_post, "apply_async"
+        ) as apply_async:
+            apply_async.return_value.id = "task-1"
+            post = self._create(publish_time)
+            publishing_post()
+            apply_async.assert_not_called()
+
+            with self.settings(
+                    PUBLISH_ETA_WINDOW=timezone.timedelta(hours=3)
+            ):
+                publishing_post()
+                publishing_post()
+
+        apply_async.assert_called_once_with(
+            (post.id, publish_time.isoformat()), eta=publish_time
+        )
+
+    def test_due_post_is_published_by_its_task(self):
+        """Test a post due now is published without waiting for a sweep"""
+        post = self._create(timezone.now() - timezone.timedelta(seconds=1))
+
+        post.refresh_from_db()
+        self.assertTrue(post.is_published)
+        self.assertEqual(publishing_post(), [])
+
+    def test_future_post_is_published_when_due(self):
+        """Test a future post waits for its time, then its task publishes"""
+        publish_time = timezone.now() + timezone.timedelta(seconds=1)
+        post = self._create(publish_time)
+
+        post.refresh_from_db()
+        self.assertFalse(post.is_published)
+        eta = get_redis().hget(publishing.eta_key(post.id), "eta")
+        self.assertFalse(publish_scheduled_post.apply((post.id, eta)).get())
+
+        time.sleep(
+            max((publish_time - timezone.now()).total_seconds(), 0) + 0.1
+        )
+        self.assertTrue(publish_scheduled_post.apply((post.id, eta)).get())
+        post.refresh_from_db()
+        self.assertTrue(post.is_published)
+
+    def test_task_is_idempotent_and_ignores_stale_times(self):
+        """Test repeated, early and moved-time deliveries change nothing"""
+        publish_time = timezone.now() + timezone.timedelta(hours=1)
+        post = self._create(publish_time)
+        self.assertFalse(
+            publish_scheduled_post(post.id, publish_time.isoformat())
+        )
+
+        moved_time = timezone.now() - timezone.timedelta(minutes=1)
+        Post.objects.filter(id=post.id).update(
+            scheduled_publish_time=moved_time
+        )
+        self.assertFalse(
+            publish_scheduled_post(post.id, publish_time.isoformat())
+        )
+        self.assertTrue(
+            publish_scheduled_post(post.id, moved_time.isoformat())
+        )
+        self.assertFalse(
+            publish_scheduled_post(post.id, moved_time.isoformat())
+        )
+
+    def test_schedule_change_revokes_previous_task(self):
+        """Test only a changed publish time replaces the pending task"""
+        publish_time = timezone.now() + timezone.timedelta(minutes=10)
+        with mock.patch.object(
+                publish_scheduled_post, "apply_async"
+        ) as apply_async, mock.patch.object(
+            publishing, "_revoke"
+        ) as revoke:
+            apply_async.return_value.id = "task-1"
+            post = self._create(publish_time)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                post.title = "Edited"
+                post.save()
+            self.assertEqual(apply_async.call_count, 1)
+            revoke.assert_not_called()
+
+            apply_async.return_value.id = "task-2"
+            with self.captureOnCommitCallbacks(execute=True):
+                post.scheduled_publish_time = (
+                    publish_time + timezone.timedelta(minutes=5)
+                )
+                post.save()
+            revoke.assert_called_once_with("task-1")
+
+            with self.captureOnCommitCallbacks(execute=True):
+                post.scheduled_publish_time = (
+                    publish_time + timezone.timedelta(hours=1)
+                )
+                post.save()
+            revoke.assert_called_with("task-2")
+            self.assertEqual(apply_async.call_count, 2)
+        self.assertFalse(get_redis().exists(publishing.eta_key(post.id)))
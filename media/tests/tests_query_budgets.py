@@ -0,0 +1,218 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media import suggestions
+from media.models import Comment, Hashtag, Profile, Post, UserReaction
+from media.redis_client import get_redis
+
+
+# Queries per request against the seeded data below, for every route of
+# the media and user APIs that answers GET. List budgets do not depend on
+# the page size, so adding rows must not change them. Detail views with
+# conditional GET include their ETag aggregate.
+QUERY_BUDGETS = {
+    "media:api-root": 0,
+    "media:profile-list": 2,
+    "media:profile-detail": 3,
+    "media:profile-following-to-me-list": 3,
+    "media:follow-suggestions": 1,
+    "media:my-followings": 4,
+    "media:my-subscribers": 3,
+    "media:my-mutual-follows": 3,
+    "media:my-followers-not-followed-back": 3,
+    "media:shared-followers": 4,
+    "media:post-list": 1,
+    "media:post-detail": 2,
+    "media:hashtag-list": 1,
+    "media:hashtag-posts": 1,
+    "media:reactions-list": 1,
+    "media:all-comments-detail": 3,
+    "media:post-comments": 2,
+    "media:comment-thread": 3,
+    "media:feed": 2,
+    "media:trending": 0,
+    "media:metrics": 0,
+    "user:manage_user": 1,
+}
+STAFF_ROUTES = {"media:metrics"}
+# Queries per POST to the write endpoints, on_commit callbacks included;
+# scheduled posts are due, so creating one also publishes it
+WRITE_BUDGETS = {
+    "media:post-list": 9,
+    "media:reactions-list": 1,
+    "media:comment-list": 5,
+    "media:set-follow": 7,
+    "media:unfollow": 8,
+    "media:bulk-follow": 7,
+    "media:bulk-unfollow": 9,
+}
+
+
+def read_route_names() -> set[str]:
+    """Names of the media and user routes that answer GET."""
+    names = set()
+    for namespace in ("media", "user"):
+        _, resolver = get_resolver().namespace_dict[namespace]
+        patterns = list(resolver.url_patterns)
+        while patterns:
+            pattern = patterns.pop()
+            if isinstance(pattern, URLResolver):
+                patterns.extend(pattern.url_patterns)
+                continue
+            actions = getattr(pattern.callback, "actions", None)
+            if actions is None:
+                answers_get = hasattr(pattern.callback.cls, "get")
+            else:
+                answers_get = "get" in actions
+            if answers_get:
+                names.add(f"{namespace}:{pattern.name}")
+    return names
+
+
+class QueryBudgetTests(TestCase):
+    seeded_users = 6
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.users = [
+            get_user_model().objects.create_user(
+                email=f"user{i}@test.com",
+                password="test_password12"
+            )
+            for i in range(self.seeded_users)
+        ]
+        self.profiles = [
+            Profile.objects.create(user=user, username=f"User_{i}")
+            for i, user in enumerate(self.users)
+        ]
+        for profile in self.profiles:
+            profile.following.set(
+                other for other in self.profiles if other != profile
+            )
+        # The last user follows the first one without being followed back
+        self.profiles[0].following.remove(self.profiles[-1])
+        suggestions.compute()
+
+        publish_time = timezone.now() - timezone.timedelta(hours=1)
+        self.posts = [
+            Post.objects.create(
+                user=user,
+                title=f"Post{i}",
+                hashtag="#art",
+                scheduled_publish_time=publish_time,
+                is_published=True,
+            )
+            for i, user in enumerate(self.users)
+        ]
+        self.root = None
+        for user in self.users:
+            self.root = Comment.objects.create(
+                user=user,
+                post=self.posts[0],
+                comment="Comment",
+                parent=self.root,
+            )
+        me = self.users[0]
+        for post in self.posts[1:]:
+            UserReaction.objects.create(user=me, post=post, reaction="L")
+        self.staff = get_user_model().objects.create_user(
+            email="staff@test.com",
+            password="test_password12",
+            is_staff=True
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(user=me)
+
+    def _url(self, name):
+        args = {
+            "media:profile-detail": [self.users[1].id],
+            "media:post-detail": [self.posts[1].id],
+            "media:shared-followers": [self.users[1].id],
+            "media:hashtag-posts": [Hashtag.objects.get().name],
+            "media:all-comments-detail": [self.posts[0].id],
+            "media:post-comments": [self.posts[0].id],
+            "media:comment-thread": [
+                Comment.objects.filter(parent__isnull=True).get().id
+            ],
+        }.get(name, [])
+        return reverse(name, args=args)
+
+    def _write(self, name):
+        first, last = self.users[1].id, self.users[-1].id
+        args = {
+            "media:set-follow": [last],
+            "media:unfollow": [first],
+        }.get(name, [])
+        data = {
+            "media:post-list": {
+                "title": "New",
+                "message": "Message",
+                "hashtag": "#art",
+                "scheduled_publish_time": timezone.now().isoformat(),
+            },
+            "media:reactions-list": {
+                "post": self.posts[1].id, "reaction": "D"
+            },
+            "media:comment-list": {
+                "post": self.posts[0].id,
+                "comment": "Reply",
+                "parent": self.root.id,
+            },
+            "media:bulk-follow": {"user_ids": [last, 999999]},
+            "media:bulk-unfollow": {"user_ids": [first, last]},
+        }.get(name, {})
+        return reverse(name, args=args), data
+
+    def test_every_read_endpoint_has_a_budget(self):
+        """Test no GET route is left out of QUERY_BUDGETS"""
+        self.assertEqual(read_route_names(), set(QUERY_BUDGETS))
+
+    def test_read_endpoints_stay_within_query_budget(self):
+        """Test every read endpoint costs a fixed number of queries"""
+        for name, budget in QUERY_BUDGETS.items():
+            url = self._url(name)
+            user = self.staff if name in STAFF_ROUTES else self.users[0]
+            self.client.force_authenticate(
+                user=get_user_model().objects.get(id=user.id)
+            )
+            with self.subTest(name):
+                with self.assertNumQueries(budget):
+                    res = self.client.get(url)
+                self.assertEqual(res.status_code, 200)
+
+    def test_write_endpoints_stay_within_query_budget(self):
+        """Test every write endpoint costs a fixed number of queries"""
+        for name, budget in WRITE_BUDGETS.items():
+            url, data = self._write(name)
+            self.client.force_authenticate(
+                user=get_user_model().objects.get(id=self.users[0].id)
+            )
+            with self.subTest(name), transaction.atomic():
+                with self.assertNumQueries(budget):
+                    with self.captureOnCommitCallbacks(execute=True):
+                        res = self.client.post(url, data, format="json")
+                self.assertLess(res.status_code, 300)
+                transaction.set_rollback(True)
+
+    def test_logout_blacklists_tokens_in_bulk(self):
+        """Test logout costs the same for any number of tokens"""
+        for _ in range(3):
+            self.client.post(
+                reverse("user:token_obtain_pair"),
+                {"email": "user0@test.com", "password": "test_password12"}
+            )
+
+        with self.assertNumQueries(2):
+            res = self.client.post(reverse("user:logout"))
+
+        self.assertEqual(res.status_code, 204)
+
+
+class LargerSeedQueryBudgetTests(QueryBudgetTests):
+    """Run the same budgets against three times the rows."""
+    seeded_users = 18
@@ -0,0 +1,101 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media import reaction_buffer
+from media.models import Profile, Post, UserReaction
+from media.redis_client import get_redis
+from media.tasks import flush_reaction_buffer
+
+
+REACTIONS_URL = reverse("media:reactions-list")
+
+
+def sample_user(email, username):
+    user = get_user_model().objects.create_user(
+        email=email,
+        password="test_password12"
+    )
+    Profile.objects.create(user=user, username=username)
+    return user
+
+
+@override_settings(REACTION_WRITE_BEHIND=True)
+class ReactionWriteBehindTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.author = sample_user("author@test.com", "author")
+        self.user = sample_user("user@test.com", "user")
+        self.post = Post.objects.create(
+            user=self.author,
+            title="Post",
+            scheduled_publish_time=timezone.now(),
+            is_published=True,
+        )
+        self.own_post = Post.objects.create(user=self.user, title="Own")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _react(self, post, reaction):
+        return self.client.post(
+            REACTIONS_URL,
+            {"post": post.id, "reaction": reaction},
+            format="json"
+        )
+
+    def test_reaction_is_queued_and_read_back(self):
+        """Test queued reactions are acknowledged and listed as pending"""
+        res = self._react(self.post, "L")
+
+        self.assertEqual(res.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(UserReaction.objects.exists())
+        res = self.client.get(REACTIONS_URL)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["reaction"], "L")
+        self.assertIsNone(res.data["results"][0]["id"])
+
+    def test_invalid_reactions_are_not_queued(self):
+        """Test missing and own posts are rejected before queueing"""
+        missing = self.client.post(
+            REACTIONS_URL,
+            {"post": self.post.id + 100, "reaction": "L"},
+            format="json"
+        )
+        own = self._react(self.own_post, "L")
+
+        self.assertEqual(missing.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(own.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(get_redis().exists(reaction_buffer.STREAM_KEY))
+
+    def test_flush_saves_latest_reaction_and_counters(self):
+        """Test the flush keeps the newest reaction and drops invalid ones"""
+        self._react(self.post, "L")
+        self._react(self.post, "D")
+        reaction_buffer.enqueue(self.user.id, self.own_post.id, "L")
+
+        self.assertEqual(flush_reaction_buffer(), 3)
+
+        reaction = UserReaction.objects.get()
+        self.assertEqual(reaction.post, self.post)
+        self.assertEqual(reaction.reaction, "D")
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+        self.assertEqual(self.post.dislike_count, 1)
+
+        self._react(self.post, "L")
+        res = self.client.get(REACTIONS_URL)
+        self.assertEqual(len(res.data["results"]), 1)
+        self.assertEqual(res.data["results"][0]["reaction"], "L")
+
+        flush_reaction_buffer()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.post.dislike_count, 0)
+        self.assertEqual(
+            reaction_buffer.pending_reactions(self.user.id),
+            {}
+        )
@@ -0,0 +1,115 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from media.models import Profile, Post
+from media.parsers import ORJSONParser
+from media.renderers import ORJSONRenderer
+from media.serializers import PostListSerializer
+
+
+class ORJSONRendererTests(TestCase):
+
+    def test_output_matches_json_renderer(self):
+        """Test special types render like the stdlib JSONRenderer"""
+        data = {
+            "utc": datetime.datetime(
+                2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc
+            ),
+            "offset": datetime.datetime(
+                2024, 5, 1, 12, 30, tzinfo=datetime.timezone(
+                    datetime.timedelta(hours=2)
+                )
+            ),
+            "naive": datetime.datetime(2024, 5, 1, 12, 30),
+            "date": datetime.date(2024, 5, 1),
+            "decimal": Decimal("10.25"),
+            "uuid": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "lazy": gettext_lazy("Profile already exists."),
+            "text": "Привіт\u2028line",
+            "list": [None, True, 1.5],
+        }
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+        self.assertIn(
+            b'"utc":"2024-05-01T12:30:15.123456Z"',
+            ORJSONRenderer().render(data)
+        )
+        self.assertEqual(
+            ORJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2")
+        )
+        # orjson rejects non-string keys; the stdlib renderer takes over
+        self.assertEqual(
+            ORJSONRenderer().render({1: data["utc"]}),
+            JSONRenderer().render({1: data["utc"]})
+        )
+
+    def test_post_page_matches_json_renderer(self):
+        """Test a PostListSerializer page renders the same bytes"""
+        user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=user, username="Admin_user")
+        for i in range(3):
+            Post.objects.create(
+                user=user,
+                title=f"Post{i}",
+                message="Message",
+                hashtag="#art",
+                scheduled_publish_time=timezone.now(),
+                is_published=True,
+            )
+        data = PostListSerializer(Post.objects.all(), many=True).data
+
+        self.assertEqual(
+            ORJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+
+class ORJSONParserTests(TestCase):
+
+    def test_parse(self):
+        """Test JSON bodies are parsed and bad ones rejected"""
+        parser = ORJSONParser()
+
+        self.assertEqual(
+            parser.parse(io.BytesIO('{"title": "Пост"}'.encode())),
+            {"title": "Пост"}
+        )
+        for body in (b"{", b'{"rank": NaN}'):
+            with self.assertRaises(ParseError):
+                parser.parse(io.BytesIO(body))
+
+    def test_api_accepts_json(self):
+        """Test the API parses JSON requests with orjson"""
+        user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        res = client.post(
+            reverse("media:profile-list"),
+            {"username": "Admin_user", "bio": "Bio"},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(res.json()["username"], "Admin_user")
@@ -0,0 +1,116 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media.metrics import RESPONSE_CACHE_REQUESTS
+from media.models import Comment, Profile, Post
+from media.redis_client import get_redis
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        self.profile = Profile.objects.create(
+            user=self.user, username="Admin_user"
+        )
+        self.author = get_user_model().objects.create_user(
+            email="author@test.com",
+            password="test_password12"
+        )
+        self.author_profile = Profile.objects.create(
+            user=self.author, username="Author"
+        )
+        self.post = Post.objects.create(
+            user=self.author,
+            title="Post",
+            scheduled_publish_time=timezone.now(),
+            is_published=True,
+        )
+        self.post_url = reverse("media:post-detail", args=[self.post.id])
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @staticmethod
+    def _count(view, result):
+        return RESPONSE_CACHE_REQUESTS.labels(view=view, result=result).get()
+
+    def test_second_request_is_served_from_cache(self):
+        """Test a repeated detail request only runs the ETag aggregate"""
+        hits = self._count("post-detail", "hit")
+        misses = self._count("post-detail", "miss")
+
+        first = self.client.get(self.post_url)
+        with self.assertNumQueries(1):
+            second = self.client.get(self.post_url)
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self._count("post-detail", "hit"), hits + 1)
+        self.assertEqual(self._count("post-detail", "miss"), misses + 1)
+
+    def test_scope_and_query_params_are_part_of_the_key(self):
+        """Test staff callers and other query params get own entries"""
+        self.client.get(self.post_url)
+        misses = self._count("post-detail", "miss")
+
+        self.client.get(self.post_url, {"format": "json"})
+        self.user.is_staff = True
+        self.client.get(self.post_url)
+
+        self.assertEqual(self._count("post-detail", "miss"), misses + 2)
+
+    def test_post_and_reaction_changes_invalidate(self):
+        """Test post edits and reactions refresh the post detail"""
+        self.client.get(self.post_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.title = "New title"
+            self.post.save()
+        self.assertEqual(
+            self.client.get(self.post_url).data["title"], "New title"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("media:reactions-list"),
+                {"post": self.post.id, "reaction": "L"}
+            )
+        self.assertEqual(
+            self.client.get(self.post_url).data["like_count"], 1
+        )
+
+    def test_comment_and_username_changes_invalidate(self):
+        """Test new comments and renamed commenters refresh comments"""
+        url = reverse("media:all-comments-detail", args=[self.post.id])
+        self.client.get(url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                user=self.user, post=self.post, comment="Hello"
+            )
+        res = self.client.get(url)
+        self.assertEqual(res.data["comments"][0]["username"], "Admin_user")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.username = "Renamed"
+            self.profile.save()
+        res = self.client.get(url)
+        self.assertEqual(res.data["comments"][0]["username"], "Renamed")
+
+    def test_follow_changes_invalidate_profile(self):
+        """Test following someone refreshes the profile detail"""
+        url = reverse("media:profile-detail", args=[self.user.id])
+        self.assertEqual(self.client.get(url).data["following"], [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.following.add(self.author_profile)
+
+        self.assertEqual(
+            self.client.get(url).data["following"], ["author@test.com"]
+        )
@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media.models import Profile, Post, UserReaction
+from media.redis_client import get_redis
+
+
+POSTS_URL = reverse("media:post-list")
+REACTIONS_URL = reverse("media:reactions-list")
+
+
+class RowSerializerTests(TestCase):
+
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=self.user, username="Admin_user")
+        author = get_user_model().objects.create_user(
+            email="author@test.com",
+            password="test_password12"
+        )
+        publish_time = timezone.now() - timezone.timedelta(hours=1)
+        self.posts = [
+            Post.objects.create(
+                user=author,
+                title=f"Post{i}",
+                message="Message" if i % 2 else None,
+                image="uploads/post_image/post.jpg" if i % 2 else "",
+                hashtag="#art",
+                scheduled_publish_time=publish_time,
+                is_published=True,
+            )
+            for i in range(4)
+        ]
+        for post in self.posts:
+            UserReaction.objects.create(
+                user=self.user, post=post, reaction="L"
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _assert_same_json(self, url, params=None):
+        # Flushed before each request, so neither is a response cache hit
+        get_redis().flushdb()
+        with override_settings(FAST_READ_SERIALIZERS=False):
+            expected = self.client.get(url, params)
+        get_redis().flushdb()
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            res = self.client.get(url, params)
+
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+
+    def test_post_pages_match_model_serializer(self):
+        """Test row-rendered post pages are byte-identical"""
+        self._assert_same_json(POSTS_URL, {"page_size": 3})
+        self._assert_same_json(POSTS_URL, {"page": 1})
+        self._assert_same_json(
+            reverse("media:post-detail", args=[self.posts[1].id])
+        )
+        self._assert_same_json(
+            reverse("media:post-detail", args=[self.posts[1].id + 100])
+        )
+
+    def test_post_cursor_from_rows(self):
+        """Test next links built from rows walk the same pages"""
+        with override_settings(FAST_READ_SERIALIZERS=True):
+            res = self.client.get(POSTS_URL, {"page_size": 3})
+        self._assert_same_json(res.data["next"])
+
+    def test_reaction_pages_match_model_serializer(self):
+        """Test row-rendered reaction pages are byte-identical"""
+        self._assert_same_json(REACTIONS_URL)
+        self._assert_same_json(REACTIONS_URL, {"reaction": "l"})
+
+    def test_row_mixins_add_no_routes(self):
+        """Test reactions get no detail route from the row mixins"""
+        with self.assertRaises(NoReverseMatch):
+            reverse("media:reactions-detail", args=[1])
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from media import search
+from media.models import Profile, Post
+
+
+POSTS_URL = reverse("media:post-list")
+
+
+class PostSearchTests(TestCase):
+
+    def setUp(self) -> None:
+        search._backends.clear()
+        user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=user, username="Admin_user")
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+        def create(title, message, is_published=True):
+            return Post.objects.create(
+                user=user,
+                title=title,
+                message=message,
+                hashtag="friends",
+                scheduled_publish_time=timezone.now(),
+                is_published=is_published,
+            )
+
+        self.in_message = create("Weekend", "Our mountain trip photos")
+        self.in_title = create("Mountain trip", "Photos from last year")
+        self.other = create("Cooking", "Best pasta recipe")
+        self.unpublished = create("Mountain trip", "Soon", is_published=False)
+
+    def _search(self, query):
+        res = self.client.get(POSTS_URL, {"q": query})
+        return [post["id"] for post in res.data["results"]]
+
+    def test_search_ranks_title_matches_first(self):
+        """Test ?q= returns published matches ordered by relevance"""
+        self.assertEqual(
+            self._search("mountain trip"),
+            [self.in_title.id, self.in_message.id]
+        )
+
+    def test_search_pages_by_rank(self):
+        """Test search results are paginated with rank cursors"""
+        res = self.client.get(POSTS_URL, {"q": "mountain", "page_size": 1})
+        self.assertEqual(res.data["results"][0]["id"], self.in_title.id)
+
+        res = self.client.get(res.data["next"])
+        self.assertEqual(res.data["results"][0]["id"], self.in_message.id)
+        self.assertIsNone(res.data["next"])
+
+    @override_settings(
+        POST_SEARCH_BACKEND="media.search.InMemorySearchBackend"
+    )
+    def test_in_memory_backend(self):
+        """Test the pure-Python backend gives the same API"""
+        self.assertEqual(
+            self._search("mountain trip"),
+            [self.in_title.id, self.in_message.id]
+        )
+
+        self.other.message = "Pasta after a mountain hike"
+        self.other.save()
+        self.assertIn(self.other.id, self._search("mountain"))
+        self.assertEqual(self._search("pasta recipe"), [])
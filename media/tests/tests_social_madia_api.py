@@ -10,9 +10,9 @@ from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from media.models import Profile,  Post
+from media.models import Profile,  Post, UserReaction
 from media.serializers import PostListSerializer
-from media.tasks import publishing_post
+from media.tasks import publishing_post, reconcile_reaction_counts
 
 
 USER_URL = reverse("user:create")
@@ -317,3 +317,69 @@ class UserReactionSocialMediaApiTests(TestCase):
 
         self.assertEqual(res.status_code, 400)
         self.assertEqual(res.data["detail"], "You cannot like your own post.")
+
+    def test_reaction_updates_post_counters(self):
+        """Test reactions are counted on the post"""
+        payload = {
+            "post": self.post1_admin.id,
+            "reaction": "D"
+        }
+        self.client.post(REACTION_CREATE_URL, payload, format="json")
+
+        self.post1_admin.refresh_from_db()
+        self.assertEqual(self.post1_admin.like_count, 0)
+        self.assertEqual(self.post1_admin.dislike_count, 1)
+
+        res = self.client.get(POSTS_URL)
+        self.assertEqual(res.data["results"][0]["dislike_count"], 1)
+
+    def test_reconcile_reaction_counts(self):
+        """Test drifted counters are fixed by the reconciliation task"""
+        user = get_user_model().objects.get(email=self.user_data2["email"])
+        UserReaction.objects.create(
+            user=user,
+            post=self.post1_admin,
+            reaction="L"
+        )
+        Post.objects.filter(id=self.post1_admin.id).update(dislike_count=5)
+
+        fixed = reconcile_reaction_counts()
+
+        self.post1_admin.refresh_from_db()
+        self.assertEqual(fixed, 1)
+        self.assertEqual(self.post1_admin.like_count, 1)
+        self.assertEqual(self.post1_admin.dislike_count, 0)
+
+    def test_switch_reaction(self):
+        """Test posting another reaction switches the existing one"""
+        payload = {
+            "post": self.post1_admin.id,
+            "reaction": "L"
+        }
+        self.client.post(REACTION_CREATE_URL, payload, format="json")
+        res = self.client.post(
+            REACTION_CREATE_URL,
+            {**payload, "reaction": "D"},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["reaction"], "D")
+        self.assertEqual(
+            UserReaction.objects.get(post=self.post1_admin).reaction,
+            "D"
+        )
+        self.post1_admin.refresh_from_db()
+        self.assertEqual(self.post1_admin.like_count, 0)
+        self.assertEqual(self.post1_admin.dislike_count, 1)
+
+    def test_reaction_to_missing_post(self):
+        """Test reacting to a missing post is rejected"""
+        res = self.client.post(
+            REACTION_CREATE_URL,
+            {"post": self.post1_admin.id + 100, "reaction": "L"},
+            format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("post", res.data)
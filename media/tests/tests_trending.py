@@ -0,0 +1,85 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from media import trending
+from media.models import Profile, Post
+from media.redis_client import get_redis
+from media.tasks import publishing_post
+
+
+TRENDING_URL = reverse("media:trending")
+
+
+class TrendingHashtagsTests(TestCase):
+
+    def setUp(self) -> None:
+        get_redis().flushdb()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com",
+            password="test_password12"
+        )
+        Profile.objects.create(user=self.user, username="Admin_user")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_windows_count_recent_buckets_only(self):
+        """Test hour/day/week windows after compaction"""
+        now = timezone.now().timestamp()
+        trending.record_hashtags(["art"], now)
+        trending.record_hashtags(["art", "sea"], now - 3 * 60 * 60)
+        trending.record_hashtags(["sea"], now - 2 * 24 * 60 * 60)
+        trending.record_hashtags(["old"], now - 9 * 24 * 60 * 60)
+
+        for hours_ago in (9 * 24 - 1, 2 * 24 - 1, 2, 0):
+            trending.compact(now - hours_ago * 60 * 60)
+
+        self.assertEqual(
+            trending.top_hashtags("hour", 10),
+            [{"name": "art", "count": 1}]
+        )
+        self.assertEqual(
+            trending.top_hashtags("day", 10),
+            [{"name": "art", "count": 2}, {"name": "sea", "count": 1}]
+        )
+        self.assertEqual(
+            trending.top_hashtags("week", 10),
+            [{"name": "sea", "count": 2}, {"name": "art", "count": 2}]
+        )
+
+    def test_trending_endpoint_counts_published_posts(self):
+        """Test publishing posts feeds the trending endpoint"""
+        for hashtag in ("#art #sea", "#art", "#party"):
+            Post.objects.create(
+                user=self.user,
+                title="Post",
+                hashtag=hashtag,
+                scheduled_publish_time=timezone.now(),
+            )
+        publishing_post()
+
+        res = self.client.get(TRENDING_URL, {"window": "hour", "limit": 1})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [{"name": "art", "count": 2}])
+
+    def test_empty_window_is_not_recompacted(self):
+        """Test a window with no tags is answered without a compaction"""
+        self.assertEqual(trending.top_hashtags("hour", 10), [])
+
+        with mock.patch.object(trending, "compact") as compact:
+            res = self.client.get(TRENDING_URL, {"window": "hour"})
+
+        self.assertEqual(res.data, [])
+        compact.assert_not_called()
+
+    def test_invalid_window(self):
+        """Test unknown windows are rejected"""
+        res = self.client.get(TRENDING_URL, {"window": "year"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,136 @@
+"""Trending hashtags from time-bucketed Redis sorted sets.
+
+Publishing a post increments its tags in the current 5-minute bucket.
+The compaction job rolls finished buckets up into hourly and daily
+buckets and precomputes the top tags of the last hour, day and week,
+so the trending endpoint is a single sorted-set range read.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+from media.redis_client import get_redis
+
+
+MINUTE_BUCKET = 5 * 60
+HOUR_BUCKET = 60 * 60
+DAY_BUCKET = 24 * 60 * 60
+
+BUCKET_TTL = {
+    MINUTE_BUCKET: 2 * HOUR_BUCKET,
+    HOUR_BUCKET: 2 * DAY_BUCKET,
+    DAY_BUCKET: 8 * DAY_BUCKET,
+}
+
+WINDOWS = ("hour", "day", "week")
+
+# Set by every compaction. Empty windows have no key, so readers check
+# this one to tell "nothing trending" from "never compacted"; it expires
+# when the 5-minute compaction job has stopped running.
+COMPACTED_KEY = "trending:compacted"
+COMPACTED_TTL = 2 * MINUTE_BUCKET
+
+
+def bucket_key(size: int, start: int) -> str:
+    return f"trending:bucket:{size}:{start}"
+
+
+def window_key(window: str) -> str:
+    return f"trending:window:{window}"
+
+
+def bucket_start(timestamp: float, size: int) -> int:
+    return int(timestamp // size * size)
+
+
+def record_hashtags(names, timestamp: float | None = None) -> None:
+    """Count one use of every tag in the current 5-minute bucket."""
+    if not names:
+        return
+    timestamp = timestamp or timezone.now().timestamp()
+    key = bucket_key(MINUTE_BUCKET, bucket_start(timestamp, MINUTE_BUCKET))
+    pipe = get_redis().pipeline(transaction=False)
+    for name in names:
+        pipe.zincrby(key, 1, name)
+    pipe.expire(key, BUCKET_TTL[MINUTE_BUCKET])
+    pipe.execute()
+
+
+def _roll_up(redis_conn, size: int, child_size: int, start: int) -> str:
+    """Merge the finished child buckets of a bucket once, return its key."""
+    key = bucket_key(size, start)
+    if not redis_conn.exists(key):
+        children = [
+            bucket_key(child_size, child_start)
+            for child_start in range(start, start + size, child_size)
+        ]
+        redis_conn.zunionstore(key, children)
+        redis_conn.expire(key, BUCKET_TTL[size])
+    return key
+
+
+def _store_window(redis_conn, window: str, keys: list[str]) -> None:
+    key = window_key(window)
+    pipe = redis_conn.pipeline()
+    pipe.zunionstore(key, keys)
+    pipe.zremrangebyrank(key, 0, -settings.TRENDING_TOP_SIZE - 1)
+    pipe.execute()
+
+
+def compact(timestamp: float | None = None) -> None:
+    """Roll finished buckets up and precompute the trending windows."""
+    redis_conn = get_redis()
+    now = timestamp or timezone.now().timestamp()
+    current_minute = bucket_start(now, MINUTE_BUCKET)
+    current_hour = bucket_start(now, HOUR_BUCKET)
+    current_day = bucket_start(now, DAY_BUCKET)
+
+    minute_keys = [
+        bucket_key(MINUTE_BUCKET, start)
+        for start in range(
+            current_minute - HOUR_BUCKET + MINUTE_BUCKET,
+            current_minute + MINUTE_BUCKET,
+            MINUTE_BUCKET
+        )
+    ]
+    current_hour_keys = [
+        bucket_key(MINUTE_BUCKET, start)
+        for start in range(current_hour, current_minute + 1, MINUTE_BUCKET)
+    ]
+    hour_keys = [
+        _roll_up(redis_conn, HOUR_BUCKET, MINUTE_BUCKET, start)
+        for start in range(current_hour - DAY_BUCKET + HOUR_BUCKET,
+                           current_hour, HOUR_BUCKET)
+    ]
+    current_day_hour_keys = [
+        bucket_key(HOUR_BUCKET, start)
+        for start in range(current_day, current_hour, HOUR_BUCKET)
+    ]
+    day_keys = [
+        _roll_up(redis_conn, DAY_BUCKET, HOUR_BUCKET, start)
+        for start in range(current_day - 6 * DAY_BUCKET,
+                           current_day, DAY_BUCKET)
+    ]
+
+    _store_window(redis_conn, "hour", minute_keys)
+    _store_window(redis_conn, "day", current_hour_keys + hour_keys)
+    _store_window(
+        redis_conn,
+        "week",
+        current_hour_keys + current_day_hour_keys + day_keys
+    )
+    redis_conn.set(COMPACTED_KEY, current_minute, ex=COMPACTED_TTL)
+
+
+def top_hashtags(window: str, limit: int) -> list[dict]:
+    """Return the most used tags of a window with their counts."""
+    redis_conn = get_redis()
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.exists(COMPACTED_KEY)
+    pipe.zrevrange(window_key(window), 0, limit - 1, withscores=True)
+    compacted, top = pipe.execute()
+    if not compacted:
+        compact()
+        top = redis_conn.zrevrange(
+            window_key(window), 0, limit - 1, withscores=True
+        )
+    return [{"name": name, "count": int(count)} for name, count in top]
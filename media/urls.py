@@ -6,12 +6,24 @@ from media.views import (
     ProfileFollowingToMeViewSet,
     SetFollowView,
     UnFollowView,
+    BulkFollowView,
+    BulkUnFollowView,
+    FollowSuggestionsView,
     PostViewSet,
     MyFollowingView,
     MySubscribersView,
+    MyMutualFollowsView,
+    MyFollowersNotFollowedBackView,
+    SharedFollowersView,
     UserReactionViewSet,
     CommentCreationViewSet,
     AllCommentsOfPostView,
+    FeedView,
+    MetricsView,
+    HashtagViewSet,
+    TrendingHashtagsView,
+    PostCommentsView,
+    CommentThreadView,
 )
 
 
@@ -23,6 +35,7 @@ router.register(
     basename="profile-following-to-me"
 )
 router.register("posts", PostViewSet)
+router.register("hashtags", HashtagViewSet)
 router.register(
     "reactions",
     UserReactionViewSet,
@@ -47,6 +60,21 @@ urlpatterns = [
         UnFollowView.as_view(),
         name="unfollow"
     ),
+    path(
+        "bulk-follow/",
+        BulkFollowView.as_view(),
+        name="bulk-follow"
+    ),
+    path(
+        "bulk-unfollow/",
+        BulkUnFollowView.as_view(),
+        name="bulk-unfollow"
+    ),
+    path(
+        "suggestions/",
+        FollowSuggestionsView.as_view(),
+        name="follow-suggestions"
+    ),
     path(
         "my-followings/",
         MyFollowingView.as_view(),
@@ -57,6 +85,38 @@ urlpatterns = [
         MySubscribersView.as_view(),
         name="my-subscribers"
     ),
+    path(
+        "my-mutual-follows/",
+        MyMutualFollowsView.as_view(),
+        name="my-mutual-follows"
+    ),
+    path(
+        "my-followers-not-followed-back/",
+        MyFollowersNotFollowedBackView.as_view(),
+        name="my-followers-not-followed-back"
+    ),
+    path(
+        "shared-followers/<int:user_id>/",
+        SharedFollowersView.as_view(),
+        name="shared-followers"
+    ),
+    path("feed/", FeedView.as_view(), name="feed"),
+    path(
+        "posts/<int:post_id>/comments/",
+        PostCommentsView.as_view(),
+        name="post-comments"
+    ),
+    path(
+        "comments/<int:pk>/thread/",
+        CommentThreadView.as_view(),
+        name="comment-thread"
+    ),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path(
+        "trending/",
+        TrendingHashtagsView.as_view(),
+        name="trending"
+    ),
 ]
 
 app_name = "media"
@@ -1,17 +1,65 @@
-from django.contrib.auth import get_user_model
-from django.db.models import Q
+import hashlib
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import transaction
+from django.db.models import (
+    Count,
+    Exists,
+    F,
+    FloatField,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+)
+from django.db.models.functions import Cast
+from django.db.models.signals import m2m_changed
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from drf_spectacular.utils import (
+    extend_schema,
+    inline_serializer,
+    OpenApiParameter,
+)
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from rest_framework import mixins, status, views, generics
 from rest_framework.decorators import action
-from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.viewsets import GenericViewSet
 
+from media import (
+    feed,
+    reaction_buffer,
+    response_cache,
+    suggestions,
+    trending,
+)
+from media.hashtags import normalize_hashtag
+from media.pagination import (
+    CommentKeysetPagination,
+    HashtagKeysetPagination,
+    PostKeysetPagination,
+    PostSearchPagination,
+    PostTagPagination,
+    ProfileKeysetPagination,
+    ProfileSearchPagination,
+    ReactionKeysetPagination,
+)
 from media.permissions import IsOwnerProfile
 from media.serializers import (
     ProfileSerializer,
+    BulkFollowSerializer,
+    BulkFollowResultSerializer,
+    FollowSuggestionSerializer,
     ProfileImageSerializer,
     ProfileFollowingToMeSerializer,
     PostListSerializer,
@@ -20,12 +68,240 @@ from media.serializers import (
     UserReactionListSerializer,
     UserReactionCreateSerializer,
     CommentCreateSerializer,
+    PostCommentSerializer,
+    CommentThreadSerializer,
     AllCommentsOfPostSerializer,
+    HashtagSerializer,
+    TrendingHashtagSerializer,
+)
+from media.models import (
+    Profile,
+    Post,
+    UserReaction,
+    Comment,
+    Hashtag,
+    PostHashtag,
+)
+from media.row_serializers import (
+    PostListRowSerializer,
+    UserReactionListRowSerializer,
 )
-from media.models import Profile, Post, UserReaction, Comment
+from media.search import get_search_backend
+from media.tasks import (
+    generate_image_variants,
+    add_author_to_timeline,
+    add_authors_to_timeline,
+    remove_author_from_timeline,
+    remove_authors_from_timeline,
+)
+
+
+def enqueue_image_variants(model_label, pk, image) -> None:
+    """Resize an uploaded image in Celery once the upload is committed."""
+    if image:
+        name = image.name
+        transaction.on_commit(
+            lambda: generate_image_variants.delay(model_label, pk, name)
+        )
+
+
+class ConditionalGetMixin:
+    """Answer GETs with 304 Not Modified when unchanged.
+
+    Retrieve takes its ETag and Last-Modified from one aggregate over the
+    looked up object: Max() of every field in conditional_fields plus the
+    row count. Views whose fields span removable related rows turn
+    conditional_last_modified off, since Max() does not see removals. List
+    ETags come from the response cache versions of get_conditional_tags(),
+    which every write shown by the list bumps, so a list is validated
+    without touching the table and nothing is serialized.
+
+    Lists default to their whole conditional_collections: a filtered post
+    or profile list is revalidated after any post or profile write, not
+    only after writes matching its filter. Views listing the rows of one
+    object return its tag instead (e.g. the comments of one post).
+
+    ConditionalListMixin and ConditionalRetrieveMixin wrap the actions;
+    views only take the ones they have, as the router routes both.
+    """
+    conditional_fields = ("updated_at",)
+    conditional_collections = ("post", "profile")
+    conditional_last_modified = True
+
+    def get_validators(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            return self._detail_validators(
+                {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        versions = response_cache.current_versions(
+            *self.get_conditional_tags()
+        )
+        return self._etag(versions), None
+
+    def get_conditional_tags(self):
+        """Response cache tags or collections whose writes change a list."""
+        return self.conditional_collections
+
+    def _detail_validators(self, lookup):
+        queryset = self.filter_queryset(self.get_queryset()).filter(**lookup)
+        aggregates = queryset.aggregate(
+            rows=Count("pk"),
+            **{field: Max(field) for field in self.conditional_fields}
+        )
+        if not aggregates["rows"]:
+            return None, None
+
+        modified = [
+            aggregates[field] for field in self.conditional_fields
+            if aggregates[field] is not None
+        ]
+        last_modified = None
+        if self.conditional_last_modified and modified:
+            last_modified = int(max(modified).timestamp())
+        return self._etag(
+            aggregates[field]
+            for field in ("rows",) + tuple(self.conditional_fields)
+        ), last_modified
+
+    def _etag(self, state):
+        state = "|".join(str(value) for value in state)
+        etag = hashlib.md5(
+            f"{self.request.user.pk}|{self.request.get_full_path()}|"
+            f"{self.request.accepted_renderer.format}|{state}".encode()
+        ).hexdigest()
+        return f'W/"{etag}"'
+
+    def _conditional_response(self, request, get_response):
+        etag, last_modified = self.get_validators()
+        if etag is None:
+            return get_response()
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = get_response()
+        if response.status_code in (
+                status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Answer list with 304 Not Modified when unchanged."""
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(
+            request,
+            lambda: super(ConditionalListMixin, self).list(
+                request, *args, **kwargs
+            )
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Answer retrieve with 304 Not Modified when unchanged."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(
+            request,
+            lambda: super(ConditionalRetrieveMixin, self).retrieve(
+                request, *args, **kwargs
+            )
+        )
+
+
+class CachedRetrieveMixin:
+    """Serve retrieve through media.response_cache.
+
+    Views set cache_view_name and return the tag of the shown object
+    from get_cache_tag(); signals invalidate the tag when it changes.
+    """
+    cache_view_name = None
+
+    def get_cache_tag(self):
+        raise NotImplementedError
+
+    def retrieve(self, request, *args, **kwargs):
+        return response_cache.cached_response(
+            self.cache_view_name,
+            self.get_cache_tag(),
+            request,
+            lambda: super(CachedRetrieveMixin, self).retrieve(
+                request, *args, **kwargs
+            )
+        )
+
+
+class RowSerializerMixin:
+    """Build the `.values()` row serializer of list and retrieve.
+
+    Used when settings.FAST_READ_SERIALIZERS is on and the view sets
+    row_serializer_class. RowListMixin and RowRetrieveMixin serve the
+    actions, each only added to views that have that action, since the
+    router adds a route for every list/retrieve method it finds.
+    """
+    row_serializer_class = None
+
+    def get_row_serializer(self):
+        if (
+                settings.FAST_READ_SERIALIZERS
+                and self.row_serializer_class is not None
+                and self.action in ("list", "retrieve")
+        ):
+            return self.row_serializer_class(
+                context=self.get_serializer_context()
+            )
+        return None
+
+
+class RowListMixin(RowSerializerMixin):
+    """Serve list from `.values()` rows."""
+
+    def list(self, request, *args, **kwargs):
+        row_serializer = self.get_row_serializer()
+        if row_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        ordering = getattr(self.paginator, "ordering", ())
+        queryset = row_serializer.values(
+            self.filter_queryset(self.get_queryset()),
+            *[field.lstrip("-") for field in ordering]
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(row_serializer.many(queryset))
+        return self.get_paginated_response(row_serializer.many(page))
+
+
+class RowRetrieveMixin(RowSerializerMixin):
+    """Serve retrieve from a `.values()` row.
+
+    Object permissions are skipped, so only opt in views whose read
+    access is not checked per object.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        row_serializer = self.get_row_serializer()
+        if row_serializer is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            row_serializer.values(self.filter_queryset(self.get_queryset())),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        return Response(row_serializer.to_representation(row))
 
 
 class ProfileViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CachedRetrieveMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.UpdateModelMixin,
@@ -35,6 +311,12 @@ class ProfileViewSet(
     """Get create, retrieve, update and list with filters a user profile"""
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
+    pagination_class = ProfileKeysetPagination
+    cache_view_name = "profile-detail"
+    conditional_collections = ("profile",)
+
+    def get_cache_tag(self):
+        return response_cache.profile_tag(self.kwargs["pk"])
 
     @staticmethod
     def _params_to_ints(query_string):
@@ -52,7 +334,10 @@ class ProfileViewSet(
         profile = self.get_object()
         serializer = self.get_serializer(profile, data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer.save(profile_pic_variants={})
+        enqueue_image_variants(
+            "media.profile", profile.pk, profile.profile_pic
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def update(self, request, *args, **kwargs):
@@ -86,39 +371,37 @@ class ProfileViewSet(
         bio = self.request.query_params.get("bio")
         followers = self.request.query_params.get("following")
 
+        filters = Q()
+        relevance = []
+
+        # Only the word similarity operator, which the gin_trgm_ops
+        # indexes serve; an icontains branch would force a sequential scan
         if username:
-            username_ids = (Profile.objects.
-                            filter(username__icontains=username).
-                            values_list("id")
-                            )
-            queryset = Profile.objects.filter(id__in=username_ids)
+            filters &= Q(username__trigram_word_similar=username)
+            relevance.append(TrigramWordSimilarity(username, "username"))
 
         if bio:
-            bio_ids = (Profile.objects.
-                       filter(bio__icontains=bio).
-                       values_list("id")
-                       )
-            queryset = (
-                Profile.objects.filter(id__in=bio_ids))
-
-        if username and bio:
-            queryset = (
-                Profile.objects.
-                filter(Q(id__in=username_ids) &
-                       Q(id__in=bio_ids)))
+            filters &= Q(bio__trigram_word_similar=bio)
+            relevance.append(TrigramWordSimilarity(bio, "bio"))
 
         if followers:
             followers_ids = self._params_to_ints(followers)
-            queryset = Profile.objects.filter(following__in=followers_ids)
+            filters &= Q(Exists(
+                Profile.following.through.objects.filter(
+                    from_profile_id=OuterRef("pk"),
+                    to_profile_id__in=followers_ids
+                )
+            ))
 
-        if followers and username:
-            queryset = (
-                Profile.objects.
-                filter(Q(id__in=username_ids) &
-                       Q(following__in=followers_ids)))
+        queryset = queryset.filter(filters)
 
-        if self.action == ("list", "retrieve"):
-            queryset = Profile.objects.prefetch_related("following")
+        if relevance:
+            queryset = queryset.annotate(
+                relevance=Cast(reduce(operator.add, relevance), FloatField())
+            )
+
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.with_following()
 
         return queryset
 
@@ -127,14 +410,14 @@ class ProfileViewSet(
             OpenApiParameter(
                 "username",
                 type={"type": "string", "items": {"type": "username"}},
-                description="Filter by username incentive. "
-                            "Ex. ?username=admin",
+                description="Fuzzy search by username, best matches "
+                            "first. Ex. ?username=admin",
 
             ),
             OpenApiParameter(
                 "bio",
                 type={"type": "string", "items": {"type": "bio"}},
-                description="Filter by bio incentive. Ex. "
+                description="Fuzzy search by bio, best matches first. Ex. "
                             "?bio=hard",
 
             ),
@@ -149,6 +432,9 @@ class ProfileViewSet(
     )
     def list(self, request, *args, **kwargs):
         """Get list of profiles."""
+        query_params = request.query_params
+        if query_params.get("username") or query_params.get("bio"):
+            self.pagination_class = ProfileSearchPagination
         return super().list(request, *args, **kwargs)
 
 
@@ -161,13 +447,9 @@ class ProfileFollowingToMeViewSet(
 
     def get_queryset(self):
         user = self.request.user
-        current_profile = user.profile
-
-        if current_profile:
-            queryset = Profile.objects.filter(following=current_profile)
-        else:
-            queryset = Profile.objects.none()
-            raise Profile.DoesNotExist("Profile does not exist for the user.")
+        queryset = Profile.objects.filter(
+            following__user=user
+        ).with_following()
 
         return queryset
 
@@ -178,13 +460,10 @@ class SetFollowView(views.APIView):
 
     def post(self, request, user_id):
         current_user = self.request.user
-        target_user = get_object_or_404(get_user_model(), id=user_id)
-
+        target_profile = get_object_or_404(Profile, user_id=user_id)
         current_profile = Profile.objects.get(user=current_user)
-        target_profile = Profile.objects.get(user=target_user)
-        print(current_profile)
-        print(target_profile)
-        if target_profile in current_profile.following.all():
+
+        if current_profile.following.filter(pk=target_profile.pk).exists():
             return Response({"detail": f"You already have following to "
                              f"the user :{target_profile.username} with "
                              f"user_id: {target_profile.user_id}."},
@@ -192,6 +471,10 @@ class SetFollowView(views.APIView):
                             )
         else:
             current_profile.following.add(target_profile)
+            add_author_to_timeline.delay(
+                current_profile.user_id,
+                target_profile.user_id
+            )
 
             return Response(
                 {"detail": "You have subscribed successfully."},
@@ -205,13 +488,15 @@ class UnFollowView(views.APIView):
 
     def post(self, request, user_id):
         current_user = self.request.user
-        target_user = get_object_or_404(get_user_model(), id=user_id)
-
+        target_profile = get_object_or_404(Profile, user_id=user_id)
         current_profile = Profile.objects.get(user=current_user)
-        target_profile = Profile.objects.get(user=target_user)
 
-        if target_profile in current_profile.following.all():
-            current_user.profile.following.remove(target_profile)
+        if current_profile.following.filter(pk=target_profile.pk).exists():
+            current_profile.following.remove(target_profile)
+            remove_author_from_timeline.delay(
+                current_profile.user_id,
+                target_profile.user_id
+            )
             return Response(
                 {"detail": "You unsubscribed successfully."},
                 status=status.HTTP_200_OK
@@ -224,6 +509,165 @@ class UnFollowView(views.APIView):
                             )
 
 
+class BulkFollowView(views.APIView):
+    """Follow many users with one request.
+
+    Profiles are resolved with one query and the new rows go to the
+    following through table with one bulk_create; the m2m_changed signal
+    is then sent as following.add() would, so the counts and cached
+    responses stay in sync.
+    """
+    serializer_class = BulkFollowSerializer
+    follow = True
+
+    def _change_following(self, profile, user_ids):
+        through = Profile.following.through
+        if self.follow:
+            through.objects.bulk_create(
+                [
+                    through(from_profile_id=profile.pk, to_profile_id=user_id)
+                    for user_id in user_ids
+                ],
+                ignore_conflicts=True
+            )
+        else:
+            through.objects.filter(
+                from_profile_id=profile.pk, to_profile_id__in=user_ids
+            ).delete()
+
+    def _get_status(self, user_id, current_user_id, found, following):
+        if user_id not in found:
+            return "not_found"
+        if self.follow:
+            if user_id == current_user_id:
+                return "cannot_follow_self"
+            return "already_following" if user_id in following else "followed"
+        return "unfollowed" if user_id in following else "not_following"
+
+    @extend_schema(
+        responses=inline_serializer(
+            "BulkFollowResponse",
+            {"results": BulkFollowResultSerializer(many=True)}
+        )
+    )
+    def post(self, request):
+        serializer = BulkFollowSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user_ids = list(dict.fromkeys(serializer.validated_data["user_ids"]))
+        current_user_id = request.user.id
+
+        profiles = {
+            profile.user_id: profile
+            for profile in Profile.objects.filter(
+                user_id__in=user_ids + [current_user_id]
+            ).only("user_id").order_by()
+        }
+        current_profile = profiles.get(current_user_id)
+        if current_profile is None:
+            raise NotFound("Create your profile first.")
+        following = set(
+            Profile.following.through.objects.filter(
+                from_profile_id=current_user_id, to_profile_id__in=user_ids
+            ).values_list("to_profile_id", flat=True)
+        )
+
+        results = [
+            {
+                "user_id": user_id,
+                "status": self._get_status(
+                    user_id, current_user_id, profiles, following
+                ),
+            }
+            for user_id in user_ids
+        ]
+        changed_status = "followed" if self.follow else "unfollowed"
+        changed_ids = {
+            result["user_id"]
+            for result in results
+            if result["status"] == changed_status
+        }
+
+        if changed_ids:
+            action = "add" if self.follow else "remove"
+            signal_kwargs = {
+                "sender": Profile.following.through,
+                "instance": current_profile,
+                "reverse": False,
+                "model": Profile,
+                "pk_set": changed_ids,
+                "using": Profile.objects.db,
+            }
+            with transaction.atomic():
+                m2m_changed.send(action=f"pre_{action}", **signal_kwargs)
+                self._change_following(current_profile, changed_ids)
+                m2m_changed.send(action=f"post_{action}", **signal_kwargs)
+            timeline_task = (
+                add_authors_to_timeline if self.follow
+                else remove_authors_from_timeline
+            )
+            timeline_task.delay(current_user_id, sorted(changed_ids))
+
+        return Response(
+            {"results": BulkFollowResultSerializer(results, many=True).data},
+            status=status.HTTP_200_OK
+        )
+
+
+class BulkUnFollowView(BulkFollowView):
+    """Unfollow many users with one request."""
+    follow = False
+
+
+class FollowSuggestionsView(views.APIView):
+    """Who to follow: accounts followed by the accounts the user follows.
+
+    Ranked by the number of such shared connections; the lists are
+    computed offline by media.tasks.compute_follow_suggestions.
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "limit",
+                type={"type": "number"},
+                description="Number of suggestions (max 50). Ex. ?limit=10",
+            ),
+        ],
+        responses=FollowSuggestionSerializer(many=True),
+    )
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "An integer is required."})
+        limit = min(max(limit, 1), settings.FOLLOW_SUGGESTIONS_TOP_K)
+
+        user_id = request.user.id
+        candidates = suggestions.get_suggestions(user_id)
+        # Drop the accounts followed since the lists were computed
+        profiles = Profile.objects.only(
+            "user_id", "username", "profile_pic", "follower_count"
+        ).filter(
+            ~Exists(
+                Profile.following.through.objects.filter(
+                    from_profile_id=user_id, to_profile_id=OuterRef("pk")
+                )
+            )
+        ).in_bulk([candidate_id for candidate_id, _ in candidates])
+
+        results = []
+        for candidate_id, shared in candidates:
+            profile = profiles.get(candidate_id)
+            if profile is not None:
+                profile.shared_connections = shared
+                results.append(profile)
+        results = results[:limit]
+        serializer = FollowSuggestionSerializer(
+            results, many=True, context={"request": request}
+        )
+        return Response(serializer.data)
+
+
 class MyFollowingView(generics.GenericAPIView, mixins.ListModelMixin):
     """Get list of user's following"""
     serializer_class = ProfileSerializer
@@ -231,7 +675,7 @@ class MyFollowingView(generics.GenericAPIView, mixins.ListModelMixin):
     def get_queryset(self):
         current_user = self.request.user
         current_profile = get_object_or_404(Profile, user=current_user)
-        queryset = current_profile.following.all()
+        queryset = current_profile.following.with_following()
 
         return queryset
 
@@ -246,14 +690,154 @@ class MySubscribersView(generics.GenericAPIView, mixins.ListModelMixin):
     def get_queryset(self):
         current_user = self.request.user
 
-        queryset = Profile.objects.filter(following=current_user.profile)
+        queryset = Profile.objects.filter(
+            following__user=current_user
+        ).with_following()
         return queryset
 
     def get(self, request, *args, **kwargs):
         return self.list(request, *args, **kwargs)
 
 
+class FollowerIntersectionView(generics.GenericAPIView):
+    """Base of the views listing a filtered subset of one's followers.
+
+    Follower ids are read in id order from the (to_profile, from_profile)
+    index of the following table and tested against the unique
+    (from_profile, to_profile) index, so a page costs the same for 100k
+    followers and the keyset cursor seeks instead of counting.
+    """
+    serializer_class = ProfileSerializer
+    pagination_class = ProfileKeysetPagination
+
+    def get_profile_id(self):
+        return self.request.user.id
+
+    def get_conditions(self, follower_id):
+        """Filters on the follower id (an OuterRef) the followers pass."""
+        raise NotImplementedError
+
+    @staticmethod
+    def follows(follower_id, followed_id):
+        return Exists(
+            Profile.following.through.objects.filter(
+                from_profile_id=follower_id, to_profile_id=followed_id
+            )
+        )
+
+    def get_queryset(self):
+        return (
+            Profile.following.through.objects
+            .filter(to_profile_id=self.get_profile_id())
+            .annotate(user_id=F("from_profile_id"))
+            .filter(*self.get_conditions(OuterRef("from_profile_id")))
+            .values("user_id")
+        )
+
+    def get(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        profiles = (
+            Profile.objects
+            .filter(user_id__in=[row["user_id"] for row in page])
+            .with_following()
+            .order_by("user_id")
+        )
+        serializer = self.get_serializer(profiles, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class MyMutualFollowsView(FollowerIntersectionView):
+    """Get profiles the user follows that follow the user back."""
+
+    def get_conditions(self, follower_id):
+        return [self.follows(self.request.user.id, follower_id)]
+
+
+class MyFollowersNotFollowedBackView(FollowerIntersectionView):
+    """Get the user's followers the user does not follow back."""
+
+    def get_conditions(self, follower_id):
+        return [~self.follows(self.request.user.id, follower_id)]
+
+
+class SharedFollowersView(FollowerIntersectionView):
+    """Get profiles following both the user and the given profile."""
+
+    def get_conditions(self, follower_id):
+        return [self.follows(follower_id, self.kwargs["user_id"])]
+
+    def get(self, request, *args, **kwargs):
+        get_object_or_404(Profile, user_id=self.kwargs["user_id"])
+        return super().get(request, *args, **kwargs)
+
+
+class FeedView(generics.GenericAPIView):
+    """Home timeline: published posts of the profiles the user follows."""
+    serializer_class = PostListSerializer
+
+    def _get_int_param(self, name, default):
+        value = self.request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            return max(int(value), 0)
+        except ValueError:
+            raise ValidationError(
+                {name: "A non-negative integer is required."}
+            )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "offset",
+                type={"type": "number"},
+                description="Position in the timeline to start from. "
+                            "Ex. ?offset=100",
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "number"},
+                description="Number of posts per page. Ex. ?limit=20",
+            ),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        """Get a page of the home timeline, newest posts first."""
+        offset = self._get_int_param("offset", 0)
+        limit = min(
+            self._get_int_param("limit", api_settings.PAGE_SIZE) or 1,
+            api_settings.PAGE_SIZE
+        )
+        post_ids = feed.read_timeline(request.user.id, offset, limit + 1)
+        posts = feed.get_posts(post_ids[:limit])
+        serializer = self.get_serializer(posts, many=True)
+
+        next_url = None
+        if len(post_ids) > limit:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "offset", offset + limit
+            )
+        return Response({"next": next_url, "results": serializer.data})
+
+
+class MetricsView(views.APIView):
+    """Prometheus metrics of the feed, caches and background jobs."""
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        return HttpResponse(
+            generate_latest(),
+            content_type=CONTENT_TYPE_LATEST
+        )
+
+
 class PostViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CachedRetrieveMixin,
+    RowListMixin,
+    RowRetrieveMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.ListModelMixin,
@@ -262,6 +846,13 @@ class PostViewSet(
     """Manage user's posts (create, retrieve, list with filters)."""
     queryset = Post.objects.filter(is_published=True)
     serializer_class = PostListSerializer
+    row_serializer_class = PostListRowSerializer
+    pagination_class = PostKeysetPagination
+    cache_view_name = "post-detail"
+    conditional_fields = ("updated_at", "user__profile__updated_at")
+
+    def get_cache_tag(self):
+        return response_cache.post_tag(self.kwargs["pk"])
 
     @action(
         methods=["POST"],
@@ -274,7 +865,8 @@ class PostViewSet(
         post = self.get_object()
         serializer = self.get_serializer(post, data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        serializer.save(image_variants={})
+        enqueue_image_variants("media.post", post.pk, post.image)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def get_serializer_class(self):
@@ -298,6 +890,7 @@ class PostViewSet(
     def get_queryset(self):
 
         queryset = super().get_queryset()
+        query = self.request.query_params.get("q")
         username = self.request.query_params.get("username")
         title = self.request.query_params.get("title")
         message = self.request.query_params.get("message")
@@ -315,13 +908,27 @@ class PostViewSet(
             filters &= Q(message__icontains=message)
 
         if hashtag:
-            filters &= Q(hashtag__icontains=hashtag)
+            filters &= Q(tags__name=normalize_hashtag(hashtag))
 
         queryset = queryset.filter(filters)
+
+        if query:
+            queryset = get_search_backend().search(queryset, query)
+
+        if self.action in ("list", "retrieve"):
+            queryset = queryset.select_related("user__profile")
+
         return queryset
 
     @extend_schema(
         parameters=[
+            OpenApiParameter(
+                "q",
+                type={"type": "string"},
+                description="Full-text search in title, hashtag and "
+                            "message, best matches first. Ex. ?q=summer trip",
+
+            ),
             OpenApiParameter(
                 "username",
                 type={"type": "string", "items": {"type": "username"}},
@@ -346,36 +953,153 @@ class PostViewSet(
             OpenApiParameter(
                 "hashtag",
                 type={"type": "string", "items": {"type": "hashtag"}},
-                description="Filter by hashtag incentive. Ex. "
-                            "?hashtag=friends",
+                description="Filter by hashtag (exact tag, "
+                            "case-insensitive). Ex. ?hashtag=friends",
 
             ),
         ]
     )
     def list(self, request, *args, **kwargs):
         """Get list of posts."""
+        if request.query_params.get("q"):
+            self.pagination_class = PostSearchPagination
         return super().list(request, *args, **kwargs)
 
 
+class HashtagViewSet(
+    mixins.ListModelMixin,
+    GenericViewSet
+):
+    """List hashtags of published posts and get those posts by tag."""
+    queryset = Hashtag.objects.filter(
+        Exists(
+            PostHashtag.objects.filter(
+                hashtag_id=OuterRef("pk"), post__is_published=True
+            )
+        )
+    )
+    serializer_class = HashtagSerializer
+    pagination_class = HashtagKeysetPagination
+    lookup_field = "name"
+
+    @action(
+        methods=["GET"],
+        detail=True,
+        url_path="posts",
+        serializer_class=PostListSerializer,
+        pagination_class=PostTagPagination,
+    )
+    def posts(self, request, name=None):
+        """Get published posts with the hashtag, newest first."""
+        queryset = Post.objects.filter(
+            is_published=True,
+            post_hashtags__hashtag__name=normalize_hashtag(name)
+        ).select_related("user__profile")
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class TrendingHashtagsView(views.APIView):
+    """Most used hashtags of the last hour, day or week."""
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "window",
+                type={"type": "string", "enum": list(trending.WINDOWS)},
+                description="Time window: hour, day (default) or week. "
+                            "Ex. ?window=hour",
+            ),
+            OpenApiParameter(
+                "limit",
+                type={"type": "number"},
+                description="Number of hashtags (max 100). Ex. ?limit=10",
+            ),
+        ],
+        responses=TrendingHashtagSerializer(many=True),
+    )
+    def get(self, request):
+        window = request.query_params.get("window", "day")
+        if window not in trending.WINDOWS:
+            raise ValidationError(
+                {"window": f"Choose one of: {', '.join(trending.WINDOWS)}."}
+            )
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "An integer is required."})
+        limit = min(max(limit, 1), settings.TRENDING_TOP_SIZE)
+
+        return Response(trending.top_hashtags(window, limit))
+
+
 class UserReactionViewSet(
+    RowListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet
 ):
     """Get create and list user's reactions with filters."""
     serializer_class = UserReactionListSerializer
+    row_serializer_class = UserReactionListRowSerializer
+    pagination_class = ReactionKeysetPagination
+
+    def create(self, request, *args, **kwargs):
+        """Create a reaction, or switch an existing one (Like/Dislike)."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if settings.REACTION_WRITE_BEHIND:
+            self.perform_buffered_create(serializer)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        created = self.perform_create(serializer)
+        return Response(
+            serializer.data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+    def _check_post_author(self, post_author_id):
+        if post_author_id is None:
+            raise ValidationError({"post": ["Post does not exist."]})
+        if post_author_id == self.request.user.id:
+            raise ValidationError({"detail": "You cannot like your own post."})
 
     def perform_create(self, serializer):
         user = self.request.user
-        post = serializer.validated_data["post"]
-        if post.user_id == user.id:
-            raise ValidationError({"detail": "You cannot like your own post."})
-        if UserReaction.objects.filter(user=user, post=post).exists():
+        post_id = serializer.validated_data["post_id"]
+        reaction = serializer.validated_data["reaction"]
+
+        result = UserReaction.objects.upsert(user.id, post_id, reaction)
+        self._check_post_author(result.post_author_id)
+        if result.reaction_id is None:
             raise ValidationError(
                 {"detail": "You have already reacted to this post."}
             )
 
-        serializer.save(user=user)
+        response_cache.invalidate(response_cache.post_tag(post_id))
+        serializer.instance = UserReaction(
+            id=result.reaction_id,
+            user=user,
+            post_id=post_id,
+            reaction=reaction
+        )
+        return result.created
+
+    def perform_buffered_create(self, serializer):
+        """Queue the reaction once the post is checked like an upsert."""
+        user = self.request.user
+        post_id = serializer.validated_data["post_id"]
+        reaction = serializer.validated_data["reaction"]
+        self._check_post_author(
+            Post.objects.filter(id=post_id)
+            .values_list("user_id", flat=True).first()
+        )
+        reaction_buffer.enqueue(user.id, post_id, reaction)
+        serializer.instance = UserReaction(
+            user=user,
+            post_id=post_id,
+            reaction=reaction
+        )
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -398,7 +1122,9 @@ class UserReactionViewSet(
         if reaction:
             filters &= Q(reaction__icontains=reaction)
 
-        queryset = queryset.filter(filters)
+        queryset = queryset.filter(filters).select_related(
+            "user__profile", "post__user__profile"
+        )
         return queryset
 
     @extend_schema(
@@ -420,7 +1146,64 @@ class UserReactionViewSet(
     )
     def list(self, request, *args, **kwargs):
         """Get list of user reactions."""
-        return super().list(request, *args, **kwargs)
+        if not settings.REACTION_WRITE_BEHIND:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        pending = reaction_buffer.pending_reactions(request.user.id)
+        if pending:
+            page = self._merge_pending(page, pending)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def _merge_pending(self, page, pending):
+        """Show not yet flushed reactions of the caller.
+
+        Pending switches override their saved reactions; brand new ones are
+        put in front of the first page.
+        """
+        for reaction in page:
+            if reaction.post_id in pending:
+                reaction.reaction = pending[reaction.post_id]
+
+        query_params = self.request.query_params
+        first_page = (
+            "cursor" not in query_params
+            and query_params.get("page", "1") == "1"
+        )
+        if not first_page:
+            return page
+
+        saved_post_ids = set(
+            UserReaction.objects.filter(
+                user=self.request.user,
+                post_id__in=pending
+            ).values_list("post_id", flat=True)
+        )
+        new_post_ids = set(pending) - saved_post_ids
+        if not new_post_ids:
+            return page
+
+        posts = (
+            Post.objects
+            .filter(id__in=new_post_ids)
+            .exclude(user=self.request.user)
+            .select_related("user__profile")
+        )
+        post_user = query_params.get("post")
+        reaction_filter = query_params.get("reaction", "")
+        new_reactions = [
+            UserReaction(
+                user=self.request.user,
+                post=post,
+                reaction=pending[post.id]
+            )
+            for post in posts
+            if (not post_user or str(post.user_id) == post_user)
+            and reaction_filter.upper() in pending[post.id]
+        ]
+        return new_reactions + list(page)
 
 
 class CommentCreationViewSet(
@@ -429,7 +1212,7 @@ class CommentCreationViewSet(
 ):
     """Create a new comment."""
     serializer_class = CommentCreateSerializer
-    queryset = UserReaction.objects.all()
+    queryset = Comment.objects.all()
 
     def get_queryset(self):
         user = self.request.user
@@ -440,7 +1223,119 @@ class CommentCreationViewSet(
         serializer.save(user=self.request.user)
 
 
-class AllCommentsOfPostView(GenericViewSet, mixins.RetrieveModelMixin):
+class AllCommentsOfPostView(
+    ConditionalRetrieveMixin,
+    CachedRetrieveMixin,
+    GenericViewSet,
+    mixins.RetrieveModelMixin
+):
     """Shows (retrieve) all comments of post."""
     serializer_class = AllCommentsOfPostSerializer
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related("user__profile").prefetch_related(
+        Prefetch(
+            "comments",
+            queryset=Comment.objects.select_related("user__profile")
+        )
+    )
+    cache_view_name = "all-comments-detail"
+    conditional_fields = (
+        "updated_at",
+        "user__profile__updated_at",
+        "comments__updated_at",
+        "comments__user__profile__updated_at",
+    )
+    conditional_last_modified = False
+
+    def get_cache_tag(self):
+        return response_cache.post_tag(self.kwargs["pk"])
+
+
+class PostCommentsView(ConditionalGetMixin, generics.ListAPIView):
+    """Top-level comments of a post, oldest first, paginated with cursors."""
+    serializer_class = PostCommentSerializer
+    pagination_class = CommentKeysetPagination
+
+    def get_conditional_tags(self):
+        # Comment writes and renames of commenters bump the post's tag
+        return [response_cache.post_tag(self.kwargs["post_id"])]
+
+    def get_queryset(self):
+        return Comment.objects.filter(
+            post_id=self.kwargs["post_id"], parent__isnull=True
+        ).only(
+            "id", "user_id", "comment", "post_id", "reply_count", "created_at"
+        )
+
+    def get(self, request, *args, **kwargs):
+        return self._conditional_response(
+            request, lambda: self.list(request, *args, **kwargs)
+        )
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
+        if not page and not Post.objects.filter(
+                id=self.kwargs["post_id"]
+        ).exists():
+            raise NotFound("Post does not exist.")
+
+        usernames = dict(
+            Profile.objects.filter(
+                user_id__in={comment.user_id for comment in page}
+            ).values_list("user_id", "username")
+        )
+        serializer = self.get_serializer(
+            page,
+            many=True,
+            context={**self.get_serializer_context(), "usernames": usernames}
+        )
+        return self.get_paginated_response(serializer.data)
+
+
+class CommentThreadView(generics.GenericAPIView):
+    """A comment with its replies nested, fetched by one path prefix scan."""
+    serializer_class = CommentThreadSerializer
+    queryset = Comment.objects.all()
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "depth",
+                type={"type": "number"},
+                description="Number of reply levels to include "
+                            "(whole thread by default). Ex. ?depth=2",
+            ),
+        ]
+    )
+    def get(self, request, *args, **kwargs):
+        """Get a comment thread, replies in creation order."""
+        root = self.get_object()
+        comments = Comment.objects.filter(
+            path__startswith=root.path + Comment.PATH_SEPARATOR
+        )
+        depth = request.query_params.get("depth")
+        if depth is not None:
+            try:
+                depth = max(int(depth), 0)
+            except ValueError:
+                raise ValidationError(
+                    {"depth": "A non-negative integer is required."}
+                )
+            comments = comments.filter(depth__lte=root.depth + depth)
+        comments = [root] + list(comments.order_by("path"))
+
+        usernames = dict(
+            Profile.objects.filter(
+                user_id__in={comment.user_id for comment in comments}
+            ).values_list("user_id", "username")
+        )
+        serializer = self.get_serializer(
+            comments,
+            many=True,
+            context={**self.get_serializer_context(), "usernames": usernames}
+        )
+        nodes = {}
+        for node in serializer.data:
+            nodes[node["id"]] = node
+            if node["id"] != root.id:
+                nodes[node["parent"]]["replies"].append(node)
+        return Response(nodes[root.id])
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 import os
+import sys
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -40,6 +41,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "media",
     "user",
     "rest_framework",
@@ -163,6 +165,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "media.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "media.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
         "rest_framework.throttling.AnonRateThrottle",
@@ -206,8 +217,102 @@ CELERY_RESULT_BACKEND = "redis://redis:6379/0"
 CELERY_TIMEZONE = "Europe/Bratislava"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+# Seconds before the Redis broker redelivers an unacknowledged task;
+# ETA tasks wait unacknowledged, so keep it above PUBLISH_ETA_WINDOW
+CELERY_BROKER_TRANSPORT_OPTIONS = {"visibility_timeout": 2 * 60 * 60}
 
 INTERNAL_IPS = ["127.0.0.1",]
 
-CELERY_TASK_ALWAYS_EAGER = True
-CELERY_TASK_EAGER_PROPAGATES = True
+CELERY_BEAT_SCHEDULE = {
+    # Enqueues ETA tasks of posts entering PUBLISH_ETA_WINDOW and
+    # publishes anything missed (media.publishing)
+    "publish-due-posts": {
+        "task": "media.tasks.publishing_post",
+        "schedule": timedelta(minutes=10),
+    },
+    "compact-trending-hashtags": {
+        "task": "media.tasks.compact_trending_hashtags",
+        "schedule": timedelta(minutes=5),
+    },
+    "reconcile-reaction-counts": {
+        "task": "media.tasks.reconcile_reaction_counts",
+        "schedule": timedelta(hours=1),
+    },
+    "reconcile-profile-counts": {
+        "task": "media.tasks.reconcile_profile_counts",
+        "schedule": timedelta(hours=1),
+    },
+    "compute-follow-suggestions": {
+        "task": "media.tasks.compute_follow_suggestions",
+        "schedule": timedelta(hours=6),
+    },
+}
+
+# Redis for precomputed read models (timelines etc.), shared by the web,
+# Celery worker and beat processes; required (media.redis_client)
+REDIS_URL = os.getenv("REDIS_URL", "")
+
+# Home timelines (media.feed)
+FEED_TIMELINE_LENGTH = 800
+FEED_FAN_OUT_BATCH_SIZE = 1000
+# Authors with more followers are merged in at read time instead of pushed
+FEED_FAN_OUT_FOLLOWER_THRESHOLD = int(
+    os.getenv("FEED_FAN_OUT_FOLLOWER_THRESHOLD", 10000)
+)
+FEED_AUTHOR_POSTS_LENGTH = 100
+
+# Trending hashtags (media.trending)
+TRENDING_TOP_SIZE = 100
+
+# Write-behind reactions (media.reaction_buffer): queue reactions in Redis
+# and save them in batches by media.tasks.flush_reaction_buffer
+REACTION_WRITE_BEHIND = os.getenv("REACTION_WRITE_BEHIND", "") == "True"
+REACTION_FLUSH_BATCH_SIZE = 5000
+if REACTION_WRITE_BEHIND:
+    CELERY_BEAT_SCHEDULE["flush-reaction-buffer"] = {
+        "task": "media.tasks.flush_reaction_buffer",
+        "schedule": timedelta(seconds=5),
+    }
+
+# Posts flipped per UPDATE by media.tasks.publishing_post
+PUBLISH_BATCH_SIZE = 1000
+# Posts due within this window get an exact-time ETA task
+# (media.publishing); the publish-due-posts sweep enqueues later ones,
+# so it must run more often than the window is long
+PUBLISH_ETA_WINDOW = timedelta(minutes=30)
+
+# Rows per batch when media.suggestions loads the following table
+FOLLOW_GRAPH_BATCH_SIZE = 5000
+
+# Who-to-follow suggestions (media.suggestions): candidates kept per
+# user, graph rows multiplied per chunk, seconds the stored lists live
+FOLLOW_SUGGESTIONS_TOP_K = 50
+FOLLOW_SUGGESTIONS_CHUNK_SIZE = 1000
+FOLLOW_SUGGESTIONS_TIMEOUT = 2 * 24 * 60 * 60
+
+# Max user ids per bulk-follow/ or bulk-unfollow/ request
+BULK_FOLLOW_MAX_IDS = 500
+
+# Seconds a cached post/profile/comments detail response is kept
+# (media.response_cache); changes invalidate entries before that
+RESPONSE_CACHE_TIMEOUT = 5 * 60
+
+# Render post and reaction list/retrieve responses from .values() rows
+# (media.row_serializers) instead of ModelSerializer instances
+FAST_READ_SERIALIZERS = os.getenv("FAST_READ_SERIALIZERS", "") == "True"
+
+# Full-text search of posts (media.search): PostgresSearchBackend or
+# the pure-Python InMemorySearchBackend for tests and local development
+POST_SEARCH_BACKEND = os.getenv(
+    "POST_SEARCH_BACKEND",
+    "media.search.PostgresSearchBackend"
+)
+
+# Test runs (manage.py test) keep Redis data in an in-process fakeredis
+# store, installed from requirements-dev.txt, and run Celery tasks inline
+# (ignoring their eta). Everywhere else tasks go to the worker.
+TESTING = sys.argv[1:2] == ["test"]
+if TESTING:
+    REDIS_URL = "fakeredis://"
+    CELERY_TASK_ALWAYS_EAGER = True
+    CELERY_TASK_EAGER_PROPAGATES = True
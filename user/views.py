@@ -46,9 +46,14 @@ class LogoutView(GenericAPIView):
     )
     def post(self, request):
         try:
-            tokens = OutstandingToken.objects.filter(user=self.request.user)
-            for token in tokens:
-                BlacklistedToken.objects.get_or_create(token=token)
+            tokens = OutstandingToken.objects.filter(
+                user=self.request.user,
+                blacklistedtoken__isnull=True
+            )
+            BlacklistedToken.objects.bulk_create(
+                [BlacklistedToken(token=token) for token in tokens],
+                ignore_conflicts=True
+            )
 
             return Response({"detail": "Successfully logged out."}, status=204)
         except Exception as e: